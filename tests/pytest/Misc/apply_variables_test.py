@@ -0,0 +1,102 @@
+#!/usr/bin/python3
+
+import pytest
+import tricot
+
+
+variables = {
+    'name': 'tricot',
+    'flags': ['-v', 2],
+    'number': 5,
+}
+
+substitutions = [
+    [['echo', '${name}'], ['echo', 'tricot']],
+    [['echo', '${name}-${number}'], ['echo', 'tricot-5']],
+    [['echo', '${flags}', '${name}'], ['echo', '-v', '2', 'tricot']],
+    [['echo', 'x${flags}'], ['echo', "x['-v', 2]"]],
+    [['echo', '${unknown}', 1], ['echo', '${unknown}', '1']],
+    ['${flags}', ['-v', '2']],
+    [None, []],
+]
+
+
+@pytest.mark.parametrize('val, expected', substitutions)
+def test_apply_variables(val: list, expected: list):
+    '''
+    Variables should be substituted within each string of a command list. List variables
+    that make up a complete item are spliced into the command.
+    '''
+    assert tricot.Test.apply_variables(val, variables) == expected
+
+
+@pytest.mark.parametrize('val', ['echo ${name}', '${name}', {'echo': 'tricot'}])
+def test_apply_variables_type(val: list):
+    '''
+    Commands that are not a list after substitution should raise a ValueError.
+    '''
+    with pytest.raises(ValueError):
+        tricot.Test.apply_variables(val, variables)
+
+
+def test_apply_variables_copy():
+    '''
+    Applying variables should neither modify the command list nor list variables, as
+    these may be shared between several tests (e.g. when using YAML anchors).
+    '''
+    command = ['echo', '${name}', '${flags}', 1]
+    flags = list(variables['flags'])
+
+    result = tricot.Test.apply_variables(command, variables)
+
+    assert result == ['echo', 'tricot', '-v', '2', '1']
+    assert command == ['echo', '${name}', '${flags}', 1]
+    assert variables['flags'] == flags
+
+    literal = ['echo', 'tricot']
+    assert tricot.Test.apply_variables(literal, variables) is not literal
+
+
+def test_copy_variables():
+    '''
+    Copied variables should not share nested lists and dictionaries with the original
+    variables, except for the environment in the '$env' key.
+    '''
+    original = {'list': [[1], {'key': [2]}], '$runtime': {'var': ['value']}}
+    tricot.utils.add_environment(original)
+
+    snapshot = tricot.utils.copy_variables(original)
+
+    assert snapshot == original
+    assert snapshot['list'][0] is not original['list'][0]
+    assert snapshot['list'][1]['key'] is not original['list'][1]['key']
+    assert snapshot['$runtime']['var'] is not original['$runtime']['var']
+    assert snapshot['$env'] is original['$env']
+
+
+chained_variables = {
+    'greeting': 'hello ${name}',
+    'args': ['${greeting}', '${name}', '${count}', 1],
+    'self': '${greeting}',
+    'name': 'tricot',
+    'count': 3,
+    'all': ['${name}', 2],
+}
+
+chained_substitutions = [
+    [['echo', '${greeting}'], ['echo', 'hello tricot']],
+    [['echo', '${args}'], ['echo', '${greeting}', 'tricot', '3', '1']],
+    [['echo', '${self}'], ['echo', '${greeting}']],
+    [['echo', 'x-${greeting}-${all}'], ['echo', "x-hello tricot-['${name}', 2]"]],
+    [['echo', '${all}'], ['echo', '${name}', '2']],
+]
+
+
+@pytest.mark.parametrize('val, expected', chained_substitutions)
+def test_apply_variables_chained(val: list, expected: list):
+    '''
+    Variables are applied in the order of the variables dict. Placeholders within the value
+    of a variable are expanded by the variables that follow it, but not by the variables that
+    precede it. Items of spliced list variables are converted to str.
+    '''
+    assert tricot.Test.apply_variables(val, chained_variables) == expected
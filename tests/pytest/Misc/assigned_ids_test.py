@@ -0,0 +1,39 @@
+#!/usr/bin/python3
+
+import pytest
+import tricot
+
+
+config = '''
+tester:
+  title: IDs
+  id: ids_tester
+
+tests:
+  - title: Test
+    id: ids_test
+    command:
+      - echo
+    validators:
+      - status: 0
+'''
+
+
+def test_assigned_ids(tmp_path):
+    '''
+    Loading the same IDs twice should raise a DuplicateIDError, unless the registry
+    of assigned IDs was cleared in between.
+    '''
+    path = tmp_path / 'ids.yml'
+    path.write_text(config)
+
+    tricot.clear_assigned_ids()
+    tricot.Tester.from_file(path)
+
+    with pytest.raises(tricot.DuplicateIDError):
+        tricot.Tester.from_file(path)
+
+    tricot.clear_assigned_ids()
+    tester = tricot.Tester.from_file(path)
+
+    assert tester.get_id_set() == {'ids_test'}
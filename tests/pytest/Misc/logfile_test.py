@@ -0,0 +1,125 @@
+#!/usr/bin/python3
+
+import sys
+import pytest
+import tricot
+
+
+config = '''
+tester:
+  title: Logfile Tests
+  error_mode: continue
+
+tests:
+  - title: Logged
+    id: logged_test
+    command: [echo, logged]
+    logfile: {tmp}/logged.log
+    validators:
+      - status: 0
+
+  - title: Filtered
+    id: filtered_test
+    command: [echo, filtered]
+    logfile: {tmp}/filtered.log
+    validators:
+      - status: 0
+'''
+
+
+@pytest.fixture(autouse=True)
+def logger(monkeypatch):
+    '''
+    Run each test without a Logger tee and restore the previous tee and sys.stdout
+    afterwards. The tee created by the test needs to restore sys.stdout on its own.
+
+    Parameters:
+        None
+
+    Returns:
+        None
+    '''
+    stdout = sys.stdout
+
+    monkeypatch.setattr(tricot.Logger, 'tee', None)
+    monkeypatch.setattr(sys, 'stdout', stdout)
+
+    yield
+
+    tricot.Logger.close_logfiles()
+    assert sys.stdout is stdout
+
+
+def test_lazy_logfile(tmp_path):
+    '''
+    Logfiles should be created when the corresponding test runs. Logfiles of
+    filtered tests should not be created.
+    '''
+    path = tmp_path / 'logfile.yml'
+    path.write_text(config.format(tmp=tmp_path))
+
+    tricot.clear_assigned_ids()
+    tester = tricot.Tester.from_file(path)
+
+    assert not (tmp_path / 'logged.log').exists()
+
+    tester.filter_tests({'logged_test'}, None, None, None)
+    tester.run()
+
+    assert 'Logged... success' in (tmp_path / 'logged.log').read_text()
+    assert not (tmp_path / 'filtered.log').exists()
+
+
+shared_config = '''
+tester:
+  title: Shared Logfile
+  logfile: {tmp}/shared.log
+
+tests:
+  - title: Inner
+    command: [echo, inner]
+    logfile: {tmp}/shared.log
+    validators:
+      - status: 0
+
+  - title: After
+    command: [echo, after]
+    validators:
+      - status: 0
+'''
+
+
+def test_shared_logfile(tmp_path):
+    '''
+    A test that uses the logfile of its tester should not stop the tester from
+    mirroring its remaining output into the logfile.
+    '''
+    path = tmp_path / 'shared.yml'
+    path.write_text(shared_config.format(tmp=tmp_path))
+
+    tester = tricot.Tester.from_file(path)
+    tester.run()
+
+    content = (tmp_path / 'shared.log').read_text()
+
+    assert 'Inner... success' in content
+    assert 'After... success' in content
+
+
+def test_close_logfiles(tmp_path):
+    '''
+    Closing the logfiles should flush and close them and restore sys.stdout.
+    '''
+    stdout = sys.stdout
+    path = tmp_path / 'close.log'
+
+    tricot.Logger.add_logfile(str(path))
+    tricot.Logger.print_plain('closed')
+
+    assert sys.stdout is tricot.Logger.tee
+
+    tricot.Logger.close_logfiles()
+
+    assert sys.stdout is stdout
+    assert tricot.Logger.tee is None
+    assert path.read_text() == 'closed\n'
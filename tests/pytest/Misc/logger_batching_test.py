@@ -0,0 +1,34 @@
+#!/usr/bin/python3
+
+import tricot
+
+
+def test_batched_output(capsys):
+    '''
+    Output created within a batched region should be written at once when
+    leaving the region.
+    '''
+    with tricot.Logger.batched() as buf:
+
+        tricot.Logger.print_plain('first')
+        tricot.Logger.print_lines(['second\n', 'third\n'])
+
+        assert capsys.readouterr().out == ''
+        assert buf.getvalue() == 'first\nsecond\nthird\n'
+
+    assert capsys.readouterr().out == 'first\nsecond\nthird\n'
+
+
+def test_nested_batches(capsys):
+    '''
+    Nested batched regions should reuse the outer buffer.
+    '''
+    with tricot.Logger.batched() as outer:
+
+        with tricot.Logger.batched() as inner:
+            tricot.Logger.print_plain('nested')
+
+        assert inner is outer
+        assert capsys.readouterr().out == ''
+
+    assert capsys.readouterr().out == 'nested\n'
@@ -0,0 +1,106 @@
+#!/usr/bin/python3
+
+import sys
+import pytest
+import tricot
+
+
+config = '''
+tester:
+  title: Parallel Tests
+  parallel: {parallel}
+  error_mode: continue
+
+tests:
+  - title: First
+    command: ['{python}', '{script}', first, first, '{log}']
+    validators:
+      - contains:
+          values: [first]
+
+  - title: Second
+    command: ['{python}', '{script}', second, second, '{log}']
+    extractors:
+      - regex:
+          pattern: sec.nd
+          variable: extracted
+    validators:
+      - contains:
+          values: [second]
+
+  - title: Third
+    command: ['{python}', '{script}', third, '${{extracted}}', '{log}']
+    validators:
+      - contains:
+          values: [second]
+
+  - title: Fourth
+    command: ['${{prev}}']
+    validators:
+      - contains:
+          values: [second]
+'''
+
+
+script = '''
+import sys
+import time
+
+start = time.time()
+time.sleep(0.5)
+print(sys.argv[2])
+
+with open(sys.argv[3], 'a') as f:
+    f.write(f'{sys.argv[1]} {start} {time.time()}\\n')
+'''
+
+
+@pytest.mark.parametrize('parallel', [1, 4])
+def test_parallel(tmp_path, capsys, parallel: int):
+    '''
+    Test commands should run concurrently until a test with extractors is reached, while
+    the output is created in test order. Each command records the interval it was running
+    in, which is used to check whether commands overlapped.
+    '''
+    log = tmp_path / 'intervals.log'
+    (tmp_path / 'interval.py').write_text(script)
+
+    path = tmp_path / 'parallel.yml'
+    path.write_text(config.format(parallel=parallel, python=sys.executable, script=tmp_path / 'interval.py', log=log))
+
+    tester = tricot.Tester.from_file(str(path))
+    assert tester.parallel == parallel
+
+    tester.run()
+
+    out = capsys.readouterr().out
+    results = [line.split(' ', 2)[-1].strip() for line in out.splitlines() if '...' in line]
+
+    assert results == ['1. First... success', '2. Second... success', '3. Third... success', '4. Fourth... success']
+
+    intervals = {}
+
+    for line in log.read_text().splitlines():
+        name, start, end = line.split()
+        intervals[name] = (float(start), float(end))
+
+    first, second, third = intervals['first'], intervals['second'], intervals['third']
+
+    assert second[1] <= third[0]
+
+    if parallel == 1:
+        assert first[1] <= second[0]
+
+    else:
+        assert first[0] < second[1] and second[0] < first[1]
+
+
+def test_parallel_type(tmp_path):
+    '''
+    The parallel attribute needs to be a positive integer.
+    '''
+    path = tmp_path / 'parallel.yml'
+    path.write_text(config.format(parallel=0, python=sys.executable, script='interval.py', log='intervals.log'))
+
+    with pytest.raises(tricot.TricotException):
+        tricot.Tester.from_file(str(path))
@@ -0,0 +1,249 @@
+#!/usr/bin/python3
+
+import os
+import json
+import time
+import pytest
+import hashlib
+import tricot.resource
+
+
+@pytest.fixture(autouse=True)
+def hash_cache(tmp_path, monkeypatch):
+    '''
+    Point the hash cache to a temporary location and reset the loaded cache.
+    '''
+    path = tmp_path / 'cache' / 'resources.json'
+
+    monkeypatch.setattr(tricot.resource, 'HASH_CACHE', path)
+    monkeypatch.setattr(tricot.resource, 'hash_cache', None)
+
+    return path
+
+
+def create_resource(path, content):
+    '''
+    Write the specified content to path and return a resource that expects it.
+    '''
+    path.write_bytes(content)
+    digest = hashlib.sha256(content).hexdigest()
+
+    return tricot.Resource({'path': str(path), 'hash': {'sha256': digest}})
+
+
+def rewrite(path, content):
+    '''
+    Replace the content of path without changing its inode and modification time.
+    '''
+    stat = path.stat()
+    path.write_bytes(content)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+
+def test_hash_cache_disabled(tmp_path, monkeypatch):
+    '''
+    Without a configured hash cache, hashes should be computed on each validation
+    and no cache file should be written.
+    '''
+    monkeypatch.setattr(tricot.resource, 'HASH_CACHE', None)
+    resource = create_resource(tmp_path / 'resource', b'first')
+    resource.validate()
+
+    rewrite(tmp_path / 'resource', b'other')
+
+    with pytest.raises(tricot.ResourceValidationException):
+        resource.validate()
+
+    assert not (tmp_path / 'cache').exists()
+
+
+def test_hash_cache_hit(tmp_path, hash_cache):
+    '''
+    Hashes should be written to the cache file and be used for unmodified files.
+    '''
+    resource = create_resource(tmp_path / 'resource', b'first')
+    resource.validate()
+
+    cache = json.loads(hash_cache.read_text())
+    entry = cache[str((tmp_path / 'resource').resolve())]
+
+    assert entry['hashes'] == {'sha256': resource.hash['sha256']}
+
+    rewrite(tmp_path / 'resource', b'other')
+    tricot.resource.hash_cache = None
+
+    resource.validate()
+
+
+def test_hash_cache_invalidation(tmp_path):
+    '''
+    Cached hashes should not be used after the file was modified.
+    '''
+    resource = create_resource(tmp_path / 'resource', b'first')
+    resource.validate()
+
+    (tmp_path / 'resource').write_bytes(b'modified')
+
+    with pytest.raises(tricot.ResourceValidationException):
+        resource.validate()
+
+
+def test_hash_cache_corrupted(tmp_path, hash_cache):
+    '''
+    A corrupted cache file should be ignored and replaced by a valid one.
+    '''
+    hash_cache.parent.mkdir()
+
+    for content in ['{"unterminated', '[]', '{"key": "value"}']:
+
+        hash_cache.write_text(content)
+        tricot.resource.hash_cache = None
+
+        resource = create_resource(tmp_path / 'resource', content.encode())
+        resource.validate()
+
+        cache = json.loads(hash_cache.read_text())
+        assert cache[str((tmp_path / 'resource').resolve())]['hashes'] == resource.hash
+
+
+def test_hash_cache_modified_during_hashing(tmp_path, monkeypatch):
+    '''
+    A file that is modified while its hash is computed should not be trusted by the cache.
+    '''
+    path = tmp_path / 'resource'
+    resource = create_resource(path, b'first')
+
+    class Hasher:
+
+        def __init__(self):
+            self.hasher = hashlib.sha256()
+
+        def update(self, data):
+            self.hasher.update(data)
+            stat = path.stat()
+            path.write_bytes(b'other')
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        def hexdigest(self):
+            return self.hasher.hexdigest()
+
+    monkeypatch.setitem(tricot.resource.HASH_CONSTRUCTORS, 'sha256', Hasher)
+    resource.validate()
+
+    monkeypatch.setitem(tricot.resource.HASH_CONSTRUCTORS, 'sha256', hashlib.sha256)
+
+    with pytest.raises(tricot.ResourceValidationException):
+        resource.validate()
+
+
+def test_hash_cache_malformed_entry(tmp_path, hash_cache):
+    '''
+    Malformed entries of the cache file should be treated as cache misses and be replaced.
+    '''
+    path = tmp_path / 'resource'
+    key = str(path.resolve())
+    hash_cache.parent.mkdir()
+
+    resource = create_resource(path, b'content')
+    stamp = tricot.resource.file_stamp(path)
+
+    for entry in [[], {'stamp': stamp}, {'stamp': stamp, 'hashes': []}, {'stamp': stamp, 'hashes': {'sha256': 1}}]:
+
+        hash_cache.write_text(json.dumps({key: entry}))
+        tricot.resource.hash_cache = None
+
+        resource.validate()
+
+        cache = json.loads(hash_cache.read_text())
+        assert cache[key] == {'stamp': stamp, 'hashes': resource.hash}
+
+
+def test_hash_cache_write_error(tmp_path, hash_cache, monkeypatch):
+    '''
+    Errors while writing the cache should not leave temporary files behind.
+    '''
+    def dump(obj, fp):
+        fp.write('{')
+        raise OSError('disk full')
+
+    monkeypatch.setattr(tricot.resource.json, 'dump', dump)
+
+    resource = create_resource(tmp_path / 'resource', b'first')
+    resource.validate()
+
+    assert list(hash_cache.parent.iterdir()) == []
+
+
+def test_strongest_hash(tmp_path):
+    '''
+    Only the strongest specified hash should be verified. Incorrect weaker hashes are
+    ignored, whereas an incorrect strongest hash fails the validation.
+    '''
+    path = tmp_path / 'resource'
+    path.write_bytes(b'content')
+
+    hashes = {hash_type: constructor(b'content').hexdigest() for hash_type, constructor in tricot.resource.HASH_CONSTRUCTORS.items()}
+    wrong = 'a' * 32
+
+    tricot.Resource({'path': str(path), 'hash': {'sha256': hashes['sha256'], 'sha1': wrong, 'md5': wrong}}).validate()
+    tricot.Resource({'path': str(path), 'hash': {'md5': hashes['md5'], 'sha512': hashes['sha512']}}).validate()
+
+    with pytest.raises(tricot.ResourceValidationException):
+        tricot.Resource({'path': str(path), 'hash': {'sha512': wrong, 'sha256': hashes['sha256'], 'md5': hashes['md5']}}).validate()
+
+    with pytest.raises(tricot.ResourceValidationException):
+        tricot.Resource({'path': str(path), 'hash': {'md5': hashes['md5'], 'sha1': wrong}}).validate()
+
+
+def test_unknown_hash_type(tmp_path):
+    '''
+    Hash attributes that contain no supported hash type should fail the validation.
+    '''
+    path = tmp_path / 'resource'
+    path.write_bytes(b'content')
+
+    with pytest.raises(tricot.ResourceValidationException):
+        tricot.Resource({'path': str(path), 'hash': {'crc32': '0'}}).validate()
+
+
+class SlowResource(tricot.Resource):
+    '''
+    Resource that waits for the specified delay before it is validated.
+    '''
+
+    def __init__(self, attrs, delay):
+        super().__init__(attrs)
+        self.delay = delay
+
+    def validate(self):
+        time.sleep(self.delay)
+        super().validate()
+
+
+def test_validate_all_output(tmp_path, capsys):
+    '''
+    Output of concurrently validated resources should be written in list order and
+    stop at the first failed resource.
+    '''
+    resources = []
+
+    for ctr, mode in enumerate(['0600', '0640', '0644']):
+
+        path = tmp_path / f'resource-{ctr}'
+        path.write_bytes(b'content')
+        resources.append(SlowResource({'path': str(path), 'mode': mode}, 0.1 * (2 - ctr)))
+
+    tricot.Resource.validate_all(resources)
+    output = capsys.readouterr().out
+
+    assert output.index('0600') < output.index('0640') < output.index('0644')
+
+    resources.insert(1, SlowResource({'path': str(tmp_path / 'missing')}, 0))
+
+    with pytest.raises(tricot.ResourceValidationException):
+        tricot.Resource.validate_all(resources)
+
+    output = capsys.readouterr().out
+
+    assert '0600' in output
+    assert '0640' not in output
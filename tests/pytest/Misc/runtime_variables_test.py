@@ -0,0 +1,52 @@
+#!/usr/bin/python3
+
+import pytest
+import tricot
+
+
+config = '''
+tester:
+  title: Runtime Variables
+  description: Declares runtime and environment variables that are not used
+
+variables:
+  unused: $runtime
+
+tests:
+  - title: Test
+    description: Test
+    command: [echo, test]
+{test_variables}
+    validators:
+      - status: 0
+'''
+
+
+def test_missing_runtime_variable(tmp_path):
+    '''
+    Declared runtime variables should be required when the tester is loaded, even
+    if they are not referenced.
+    '''
+    path = tmp_path / 'runtime.yml'
+    path.write_text(config.format(test_variables=''))
+
+    with pytest.raises(tricot.utils.TricotRuntimeVariableError):
+        tricot.Tester.from_file(str(path))
+
+    tricot.Tester.from_file(str(path), runtime_vars={'unused': 'value'})
+
+
+def test_missing_env_variable(tmp_path, monkeypatch):
+    '''
+    Declared environment variables of tests should be required when the test is loaded,
+    even if they are not referenced.
+    '''
+    path = tmp_path / 'env.yml'
+    path.write_text(config.format(test_variables='    variables:\n      TRICOT_TEST_UNUSED: $env'))
+    monkeypatch.delenv('TRICOT_TEST_UNUSED', raising=False)
+
+    with pytest.raises(tricot.utils.TricotEnvVariableError):
+        tricot.Tester.from_file(str(path), runtime_vars={'unused': 'value'})
+
+    monkeypatch.setenv('TRICOT_TEST_UNUSED', 'value')
+    tricot.Tester.from_file(str(path), runtime_vars={'unused': 'value'})
@@ -0,0 +1,49 @@
+#!/usr/bin/python3
+
+import atexit
+import tricot
+
+from pathlib import Path
+
+
+class FailingPlugin(tricot.Plugin):
+    '''
+    Plugin that raises an exception when it is stopped.
+    '''
+
+    def stop(self):
+        raise RuntimeError('stop failed')
+
+
+def test_stop_plugins(monkeypatch, capsys):
+    '''
+    The stop_plugins handler should be registered when the first plugin is started and
+    log exceptions raised by plugins instead of aborting.
+    '''
+    registered = []
+
+    def unregister(func):
+        while func in registered:
+            registered.remove(func)
+
+    monkeypatch.setattr(tricot.plugin, 'running_plugins', {})
+    monkeypatch.setattr(atexit, 'register', registered.append)
+    monkeypatch.setattr(atexit, 'unregister', unregister)
+    monkeypatch.setattr(tricot.Logger, 'tee', None)
+
+    assert registered == []
+
+    first = FailingPlugin(Path(__file__), 'first', None, {})
+    second = FailingPlugin(Path(__file__), 'second', None, {})
+
+    first._run()
+    second._run()
+
+    assert registered == [tricot.plugin.stop_plugins]
+
+    tricot.plugin.stop_plugins()
+    out = capsys.readouterr().out
+
+    assert tricot.plugin.running_plugins == {}
+    assert out.index('second') < out.index('first')
+    assert out.count('RuntimeError - stop failed') == 2
@@ -0,0 +1,44 @@
+#!/usr/bin/python3
+
+import os
+import tricot
+
+
+def test_yaml_cache(tmp_path):
+    '''
+    Parsed .yml files should be cached until the file changes and callers should
+    obtain independent copies of the cached content.
+    '''
+    path = tmp_path / 'cache.yml'
+    path.write_text('tester:\n  title: first\n')
+
+    first = tricot.load_yaml(path)
+    first['tester']['title'] = 'modified'
+
+    assert tricot.load_yaml(path) == {'tester': {'title': 'first'}}
+
+    stat = path.stat()
+    path.write_text('tester:\n  title: second\n')
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert tricot.load_yaml(path) == {'tester': {'title': 'second'}}
+
+
+def test_clear_yaml_cache(tmp_path):
+    '''
+    Clearing the cache should cause files to be parsed again, even if their modification
+    time and size did not change.
+    '''
+    path = tmp_path / 'cache.yml'
+    path.write_text('tester:\n  title: first\n')
+
+    assert tricot.load_yaml(path) == {'tester': {'title': 'first'}}
+
+    stat = path.stat()
+    path.write_text('tester:\n  title: other\n')
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert tricot.load_yaml(path) == {'tester': {'title': 'first'}}
+
+    tricot.clear_yaml_cache()
+    assert tricot.load_yaml(path) == {'tester': {'title': 'other'}}
@@ -57,6 +57,18 @@ def test_cleanup_plugin(config: dict, files_deleted: list):
             assert file.exists()
 
 
+@pytest.mark.parametrize('item', ['/', '/home', '/home/', '/opt', '/var'])
+def test_cleanup_blacklist(item: str):
+    '''
+    Checks whether blacklisted items are matched after path resolution.
+
+    Parameters:
+        item            Item that should be blacklisted
+    '''
+    plug = tricot.get_plugin(Path(__file__), 'cleanup', {'items': [item]}, {})
+    assert plug.resolve_path(item) in tricot.plugin.CleanupPlugin.blacklist
+
+
 @pytest.fixture(autouse=True)
 def resource():
     '''
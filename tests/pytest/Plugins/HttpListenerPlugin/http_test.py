@@ -1,5 +1,7 @@
 #!/usr/bin/python3
 
+import time
+import socket
 import tricot
 import pytest
 import requests
@@ -62,6 +64,31 @@ def test_http_listener_plugin(config: dict, result: bool, status: int, file: str
     plug.stop()
 
 
+def test_http_listener_stalled_client():
+    '''
+    A client that connects without sending a request should neither block requests of
+    other clients nor stopping the listener.
+
+    Parameters:
+        None
+
+    Returns:
+        None
+    '''
+    plug = tricot.get_plugin(Path(__file__), 'http_listener', config_list[0], {})
+    plug.run()
+
+    with socket.create_connection(('127.0.0.1', 8000)):
+
+        r = requests.get(f'http://127.0.0.1:8000/{test_file}', timeout=5)
+        assert r.status_code == 200
+
+        start = time.monotonic()
+        plug.stop()
+
+        assert time.monotonic() - start < 5
+
+
 @pytest.fixture(autouse=True)
 def resource():
     '''
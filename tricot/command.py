@@ -4,6 +4,7 @@ import os
 import signal
 import timeit
 import subprocess
+import concurrent.futures
 from typing import Any
 from pathlib import Path
 
@@ -50,7 +51,8 @@ class Command:
         self.shell = shell
         self.command = command
 
-    def run(self, path: Path, timeout: int, hotplug_variables: dict[str, Any] = None, env: dict = {}):
+    def run(self, path: Path, timeout: int, hotplug_variables: dict[str, Any] = None, env: dict = {},
+            future: concurrent.futures.Future = None):
         '''
         Just a wrapper around the actual command execution function. It is basically used
         to reduce the complexity of the run function and to handle the special case of
@@ -62,17 +64,24 @@ class Command:
             timeout             Timeout to use during command execution
             hotplug_variables   Variables that are applied at runtime.
             env                 Environment variables
+            future              Future returned by start if the command was already started
 
         Returns:
             None
         '''
         if self.command[0] != '${prev}':
-            self.command = tricot.Test.apply_variables(self.command, hotplug_variables)
+
+            if future is None:
+                self.command = tricot.Test.apply_variables(self.command, hotplug_variables)
 
             try:
                 self.path = path
-                timer = timeit.Timer(lambda: self._run(path, timeout, env))
-                self.runtime = timer.timeit(number=1)
+
+                if future is None:
+                    self._timed_run(path, timeout, env)
+
+                else:
+                    future.result()
 
             except Exception as e:
                 tricot.Logger.print_plain_red("error.")
@@ -92,6 +101,51 @@ class Command:
                 tricot.Logger.print_plain_red("error.")
                 raise tricot.TricotException("Special '${prev}' variable was used, but no previous output exists.")
 
+    def start(self, executor: concurrent.futures.Executor, path: Path, timeout: int,
+              hotplug_variables: dict[str, Any] = None, env: dict = {}) -> concurrent.futures.Future:
+        '''
+        Starts the command within the specified executor. The returned future can be passed
+        to the run function, which then waits for the command to finish instead of running
+        it again. Commands that use the special ${prev} variable cannot be started in advance.
+        The same is true for commands whose variables cannot be applied yet. For both, None
+        is returned and errors are left to the run function.
+
+        Parameters:
+            executor            Executor to start the command in
+            path                File system path where the command is run in
+            timeout             Timeout to use during command execution
+            hotplug_variables   Variables that are applied at runtime.
+            env                 Environment variables
+
+        Returns:
+            future              Future of the command execution or None
+        '''
+        if self.command[0] == '${prev}':
+            return None
+
+        try:
+            self.command = tricot.Test.apply_variables(self.command, hotplug_variables)
+
+        except Exception:
+            return None
+
+        return executor.submit(self._timed_run, path, timeout, env)
+
+    def _timed_run(self, path: Path, timeout: int, env: dict = {}) -> None:
+        '''
+        Runs the command via the _run function and stores the required time.
+
+        Parameters:
+            path                File system path where the command is run in
+            timeout             Timeout to use during command execution
+            env                 Environment variables
+
+        Returns:
+            None
+        '''
+        timer = timeit.Timer(lambda: self._run(path, timeout, env))
+        self.runtime = timer.timeit(number=1)
+
     def _run(self, path: Path, timeout: int, env: dict = {}) -> None:
         '''
         Performs the actual command execution via subprocess.Popen. All relevant outputs and
@@ -112,7 +166,7 @@ class Command:
 
         try:
             process = subprocess.Popen(self.command, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
-                                       cwd=path, env=envi, shell=self.shell, preexec_fn=os.setsid)
+                                       cwd=path, env=envi, shell=self.shell, start_new_session=True)
 
             self.stdout_raw, self.stderr_raw = process.communicate(timeout=timeout)
             self.status = process.returncode
@@ -167,7 +167,8 @@ class Condition:
     def check_format(path: Path, conditions: dict, conditionals: set[Condition]) -> None:
         '''
         Check that condition section has the correct format within a .yml file. If the format
-        is malformed, an exception is raised.
+        is malformed, an exception is raised. The names of the declared conditions are collected
+        once, so that each used condition is looked up in constant time.
 
         Parameters:
             path            Path to the .yml file
@@ -193,16 +194,18 @@ class Condition:
         if not all(isinstance(x, dict) for x in [cond_error, cond_success]):
             raise ConditionFormatException("The keys 'on_error' and 'on_success' need to be dicts", path)
 
+        names = {cond.name for cond in conditionals}
+
         for item in set(cond_all + cond_one_of + cond_none_of):
 
-            if not Condition.contains_str(item, conditionals):
+            if item not in names:
                 raise ConditionFormatException(f"Condition '{item}' was used but never declared within a tester.", path)
 
         for current_dict in [cond_error, cond_success]:
 
             for key, value in current_dict.items():
 
-                if not Condition.contains_str(key, conditionals):
+                if key not in names:
                     raise ConditionFormatException(f"Condition '{key}' was used but never declared within a tester.", path)
 
                 elif type(value) is not bool:
@@ -3,6 +3,7 @@ from __future__ import annotations
 import time
 import docker
 import atexit
+import concurrent.futures
 from typing import Any
 from pathlib import Path
 
@@ -18,6 +19,8 @@ class TricotContainer:
                  aliases: dict[str, str] = {}, network_mode: str = None, init: int = 2) -> None:
         '''
         Initializes the container and registers an atexit event, but does not start the container.
+        The docker client is created when the container is started, so that testers that are
+        filtered out or skipped do not require a connection to the docker daemon.
 
         Parameters:
             name            Name of the running container
@@ -40,7 +43,7 @@ class TricotContainer:
         self.network_mode = network_mode
         self.init = init
 
-        self.client = docker.from_env()
+        self.client = None
         self.container = None
 
         atexit.register(self.stop_container)
@@ -59,6 +62,23 @@ class TricotContainer:
         Returns:
             None
         '''
+        self.print_start()
+        self.run_container()
+
+    def print_start(self) -> None:
+        '''
+        Creates the docker client (if not already done) and prints some general information
+        about the container that is going to be started.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        '''
+        if self.client is None:
+            self.client = docker.from_env()
+
         tricot.Logger.print('')
         tricot.Logger.print_mixed_yellow('Starting container:', self.name)
         tricot.Logger.increase_indent()
@@ -72,6 +92,17 @@ class TricotContainer:
 
         tricot.Logger.decrease_indent()
 
+    def run_container(self) -> None:
+        '''
+        Runs the container and waits for its initialization. This function does not create
+        any output and can therefore be called from worker threads.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        '''
         self.client.containers.run(self.image, name=self.name, volumes=self.volumes,
                                    environment=self.env, detach=True, auto_remove=True,
                                    network_mode=self.network_mode)
@@ -95,8 +126,67 @@ class TricotContainer:
             tricot.Logger.print('')
             tricot.Logger.print_mixed_yellow('Stopping container:', self.name)
 
-            self.container.stop()
-            self.container = None
+            self.halt_container()
+
+    def halt_container(self) -> None:
+        '''
+        Stops the container without creating any output.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        '''
+        self.container.stop()
+        self.container = None
+
+    def start_all(containers: list[TricotContainer]) -> None:
+        '''
+        Starts the specified containers concurrently. The information on the containers is
+        printed in order before the containers are started, so that the output is the same
+        as for a sequential start. Running the containers and waiting for their initialization
+        happens in a thread pool, so that the startup takes as long as the slowest container
+        instead of the sum of all containers. The first exception (in list order) is raised
+        after all containers were started.
+
+        Parameters:
+            containers      List of containers to start
+
+        Returns:
+            None
+        '''
+        for container in containers:
+            container.print_start()
+
+        with concurrent.futures.ThreadPoolExecutor(len(containers)) as executor:
+            futures = [executor.submit(container.run_container) for container in containers]
+
+        for future in futures:
+            future.result()
+
+    def stop_all(containers: list[TricotContainer]) -> None:
+        '''
+        Stops the specified containers concurrently. Like for start_all, the output is
+        created in order before the containers are stopped.
+
+        Parameters:
+            containers      List of containers to stop
+
+        Returns:
+            None
+        '''
+        running = [container for container in containers if container.container]
+
+        for container in running:
+            tricot.Logger.print('')
+            tricot.Logger.print_mixed_yellow('Stopping container:', container.name)
+
+        with concurrent.futures.ThreadPoolExecutor(max(len(running), 1)) as executor:
+            futures = [executor.submit(container.halt_container) for container in running]
+
+        for future in futures:
+            future.result()
 
     def print_env(self) -> None:
         '''
@@ -1,15 +1,42 @@
 from __future__ import annotations
 
+import io
+import os
+import re
 import sys
-import json
+import atexit
+import codecs
 import typing
-from termcolor import cprint
+import threading
+import contextlib
 
 from tricot.command import Command
 from tricot.validation import Validator, ValidationException, ValidatorError
 from tricot.extractor import Extractor, ExtractException
 
 
+WRITEV_THRESHOLD = 256
+LOGFILE_BUFFER = 1 << 16
+IOV_MAX = os.sysconf('SC_IOV_MAX') if hasattr(os, 'sysconf') else 1024
+
+ANSI_RESET = '\033[0m'
+ANSI_COLORS = {
+    'grey': '\033[30m',
+    'red': '\033[31m',
+    'green': '\033[32m',
+    'yellow': '\033[33m',
+    'blue': '\033[34m',
+    'magenta': '\033[35m',
+    'cyan': '\033[36m',
+    'white': '\033[97m',
+}
+
+JSON_ESCAPES = re.compile(r'\\[nt]')
+JSON_UNESCAPE = {r'\n': '\n', r'\t': '\t'}
+
+_tls = threading.local()
+
+
 class Logger:
     '''
     A very primitive Logger class to unify indentation, colors and prefixes.
@@ -28,146 +55,226 @@ class Logger:
     tee = None
     indent = 0
     verbosity = 1
+    colors = None
 
-    def cprint(string: str, **kwargs) -> None:
+    def cprint(string: str, color: str = None, end: str = None, flush: bool = False, **kwargs) -> None:
         '''
-        Just a wrapper around termcolors cprint.
+        Print without indent or prefix in the specified color. Colors that are not
+        known by the Logger or additional arguments like 'on_color' or 'attrs' are
+        passed to termcolors cprint.
         '''
-        cprint(string, **kwargs)
+        if kwargs or color not in ANSI_COLORS:
+            from termcolor import cprint
+            cprint(string, color=color, end=end, flush=flush, file=Logger.stream(), **kwargs)
+            return
+
+        Logger.write(Logger.colorize(string, color), end, flush)
+
+    def write(string: str, end: str = None, flush: bool = False) -> None:
+        '''
+        Write an already formatted string to stdout. Like for print, 'end' defaults
+        to a newline.
+        '''
+        stream = Logger.stream()
+        stream.write(string + ('\n' if end is None else end))
+
+        if flush:
+            stream.flush()
+
+    def stream() -> typing.TextIO:
+        '''
+        Returns the stream the Logger currently writes to. Within a batched region
+        this is the batch buffer of the current thread, otherwise sys.stdout.
+        '''
+        buf = getattr(_tls, 'buf', None)
+
+        if buf is None:
+            return sys.stdout
+
+        return buf
+
+    @contextlib.contextmanager
+    def batched() -> typing.Iterator[io.StringIO]:
+        '''
+        Context manager that collects all output of the Logger in a thread local
+        buffer and writes it at once when the context is left. Nested calls reuse
+        the already existing buffer.
+
+        Parameters:
+            None
+
+        Returns:
+            buffer      Buffer the output is collected in
+        '''
+        buf = getattr(_tls, 'buf', None)
+
+        if buf is not None:
+            yield buf
+            return
+
+        _tls.buf = buf = io.StringIO()
+
+        try:
+            yield buf
+
+        finally:
+            Logger.flush_batch()
+            del _tls.buf
+
+    def flush_batch() -> None:
+        '''
+        Writes the output collected in the current batch buffer (if any) to stdout
+        and clears the buffer.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        '''
+        buf = getattr(_tls, 'buf', None)
+
+        if buf is None or buf.tell() == 0:
+            return
+
+        value = buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+
+        if len(value) < WRITEV_THRESHOLD:
+            sys.stdout.write(value)
+
+        elif Logger.tee is not None:
+            Logger.tee.write_bytes(value.encode('utf-8'))
+
+        else:
+            write_bytes(sys.stdout, value.encode('utf-8'))
+
+    def init_colors() -> dict[str, str]:
+        '''
+        Determines whether colored output is used and initializes the color codes
+        accordingly. Colors are disabled by the ANSI_COLORS_DISABLED and NO_COLOR
+        environment variables, enforced by FORCE_COLOR and otherwise only used when
+        stdout is a terminal. Like termcolor, the decision is made once on the first
+        colored output.
+        '''
+        Logger.colors = ANSI_COLORS if can_colorize() else {}
+        return Logger.colors
+
+    def colorize(string: typing.Any, color: str) -> str:
+        '''
+        Returns the string representation of the specified object in the specified
+        color.
+        '''
+        colors = Logger.colors if Logger.colors is not None else Logger.init_colors()
+
+        if not colors:
+            return str(string)
+
+        return colors[color] + str(string) + ANSI_RESET
 
     def print(string: str, *args, e: bool = False, end: str = None) -> None:
         '''
         Print with prefix and indentation.
         '''
-        print(Logger.get_prefix(e), string, *args, end=end)
+        print(Logger.get_prefix(e), string, *args, end=end, file=Logger.stream())
 
     def print_plain(string: str, *args, end: str = None) -> None:
         '''
         Print with prefix.
         '''
-        print(string, *args, end=end)
+        print(string, *args, end=end, file=Logger.stream())
 
     def print_plain_green(string: str, end: str = None) -> None:
         '''
         Print without indent or prefix, text in green.
         '''
-        cprint(string, color='green', end=end)
+        Logger.write(Logger.colorize(string, 'green'), end)
 
     def print_plain_red(string: str, end: str = None) -> None:
         '''
         Print without indent or prefix, text in red.
         '''
-        cprint(string, color='red', end=end)
+        Logger.write(Logger.colorize(string, 'red'), end)
 
     def print_plain_blue(string: str, end: str = None) -> None:
         '''
         Print without indent or prefix, text in blue.
         '''
-        cprint(string, color='blue', end=end)
+        Logger.write(Logger.colorize(string, 'blue'), end)
 
     def print_yellow(string: str, e: bool = False, end: str = None) -> None:
         '''
         Print with prefix and indent, text in yellow.
         '''
-        print(Logger.get_prefix(e), end=' ')
-        cprint(string, color='yellow', end=end)
+        Logger.write(f"{Logger.get_prefix(e)} {Logger.colorize(string, 'yellow')}", end)
 
     def print_yellow_plain(string: str, e: bool = False, end: str = None) -> None:
         '''
         Print in yellow.
         '''
-        cprint(string, color='yellow', end=end)
+        Logger.write(Logger.colorize(string, 'yellow'), end)
 
-    def print_blue(string: str, e: bool = False, end: str = None, **kwargs) -> None:
+    def print_blue(string: str, e: bool = False, end: str = None, flush: bool = False) -> None:
         '''
         Print with prefix and indent, text in blue.
         '''
-        print(Logger.get_prefix(e), end=' ', **kwargs)
-        cprint(string, color='blue', end=end, **kwargs)
+        Logger.write(f"{Logger.get_prefix(e)} {Logger.colorize(string, 'blue')}", end, flush)
+
+    def print_mixed(head: str, str2: str, args: tuple, color: str, end: str = None) -> None:
+        '''
+        Helper function for the print_mixed_* functions. Prints the already formatted
+        head, the second arg in the specified color and the rest of the args in normal
+        text color.
+        '''
+        line = head + Logger.colorize(str2, color)
+
+        if args:
+            line += ' ' + ' '.join(map(str, args))
+
+        Logger.write(line, end)
 
     def print_mixed_yellow(str1: str, str2: str, *args, e: bool = False,  end: str = None) -> None:
         '''
         Print with prefix and indent, first arg in normal text color, second arg
         in yellow and the rest of the args in normal text color again.
         '''
-        print(Logger.get_prefix(e), str1, end=' ')
-
-        if(args):
-            cprint(str2, color='yellow', end=' ')
-            print(*args, end=end)
-
-        else:
-            cprint(str2, color='yellow', end=end)
+        Logger.print_mixed(f'{Logger.get_prefix(e)} {str1} ', str2, args, 'yellow', end)
 
     def print_mixed_red(str1: str, str2: str, *args, e: bool = False,  end: str = None) -> None:
         '''
         Print with prefix and indent, first arg in normal text color, second arg
         in red and the rest of the args in normal text color again.
         '''
-        print(Logger.get_prefix(e), str1, end=' ')
-
-        if(args):
-            cprint(str2, color='red', end=' ')
-            print(*args, end=end)
-
-        else:
-            cprint(str2, color='red', end=end)
+        Logger.print_mixed(f'{Logger.get_prefix(e)} {str1} ', str2, args, 'red', end)
 
     def print_mixed_blue(str1: str, str2: str, *args, e: bool = False, end: str = None) -> None:
         '''
         Print with prefix and indent, first arg in normal text color, second arg
         in blue and the rest of the args in normal text color again.
         '''
-        print(Logger.get_prefix(e), str1, end=' ')
-
-        if(args):
-            cprint(str2, color='blue', end=' ')
-            print(*args, end=end)
-
-        else:
-            cprint(str2, color='blue', end=end)
+        Logger.print_mixed(f'{Logger.get_prefix(e)} {str1} ', str2, args, 'blue', end)
 
     def print_mixed_blue_yellow(str1: str, str2: str, *args, e: bool = False, end: str = None) -> None:
         '''
         Print with prefix and indent, first arg in blue text color, second arg
         in yellow and the rest of the args in normal text color again.
         '''
-        Logger.print_blue(str1, end=' ')
-
-        if(args):
-            cprint(str2, color='yellow', end=' ')
-            print(*args, end=end)
-
-        else:
-            cprint(str2, color='yellow', end=end)
+        Logger.print_mixed(f"{Logger.get_prefix(False)} {Logger.colorize(str1, 'blue')} ", str2, args, 'yellow', end)
 
     def print_mixed_blue_plain(str1: str, str2: str, *args, e: bool = False, end: str = None) -> None:
         '''
         Print first arg in normal text color, second arg
         in blue and the rest of the args in normal text color again.
         '''
-        print(str1, end=' ')
-
-        if(args):
-            cprint(str2, color='blue', end=' ')
-            print(*args, end=end)
-
-        else:
-            cprint(str2, color='blue', end=end)
+        Logger.print_mixed(f'{str1} ', str2, args, 'blue', end)
 
     def print_mixed_red_plain(str1: str, str2: str, *args, e: bool = False, end: str = None) -> None:
         '''
         Print first arg in normal text color, second arg
         in red and the rest of the args in normal text color again.
         '''
-        print(str1, end=' ')
-
-        if(args):
-            cprint(str2, color='red', end=' ')
-            print(*args, end=end)
-
-        else:
-            cprint(str2, color='red', end=end)
+        Logger.print_mixed(f'{str1} ', str2, args, 'red', end)
 
     def increase_indent() -> None:
         '''
@@ -208,29 +315,62 @@ class Logger:
     def print_with_indent(string: str, e: bool = False) -> None:
         '''
         Takes a string, spilts it on newlines and prints each single line
-        with the current prefix and indent.
+        with the current prefix and indent. The lines are joined into a single
+        block, so that the output is emitted with one print call.
+        '''
+        Logger.print_lines(Logger.format_with_indent(string, e))
+
+    def format_with_indent(string: str, e: bool = False) -> list[str]:
+        '''
+        Takes a string, spilts it on newlines and returns a list of lines that
+        contain the current prefix and indent.
         '''
+        prefix = Logger.get_prefix(e) + ' '
         content = string.replace('\x0d', '\n')
-        lines = content.split('\n')
-        for line in lines:
-            Logger.print(line, e=e)
+
+        return [prefix + line + '\n' for line in content.split('\n')]
 
     def print_with_indent_blue(string: str, e: bool = False) -> None:
         '''
         Takes a string, spilts it on newlines and prints each single line
         with the current prefix and indent in blue.
         '''
+        prefix = Logger.get_prefix(e) + ' '
         content = string.replace('\x0d', '\n')
-        lines = content.split('\n')
-        for line in lines:
-            Logger.print_blue(line, e=e)
 
-    def add_logfile(file: typing.TextIO) -> None:
+        Logger.print_lines([prefix + Logger.colorize(line, 'blue') + '\n' for line in content.split('\n')])
+
+    def print_lines(lines: list[str]) -> None:
         '''
-        Mirrors all output of tricot to the specified logfile.
+        Prints a list of already formatted lines as a single block. Larger blocks
+        are emitted by using vectored writes, smaller ones are joined and written
+        at once.
 
         Parameters:
-            file        Logfile to mirror to
+            lines       List of formatted lines (including line endings)
+
+        Returns:
+            None
+        '''
+        buf = getattr(_tls, 'buf', None)
+
+        if buf is not None:
+            buf.writelines(lines)
+
+        elif Logger.tee is not None:
+            Logger.tee.writev(lines)
+
+        else:
+            writev(sys.stdout, lines)
+
+    def add_logfile(file: typing.Union[typing.TextIO, str]) -> None:
+        '''
+        Mirrors all output of tricot to the specified logfile. If a path is
+        specified, the logfile is opened (and truncated) by the tee object,
+        unless output is already mirrored to it.
+
+        Parameters:
+            file        Logfile or path of the logfile to mirror to
 
         Returns:
             None
@@ -244,12 +384,12 @@ class Logger:
         else:
             Logger.tee.add(file)
 
-    def remove_logfile(file: typing.TextIO) -> None:
+    def remove_logfile(file: typing.Union[typing.TextIO, str]) -> None:
         '''
         Stop mirroring to the specified logfile.
 
         Parameters:
-            file        Logfilt to stop mirroring to
+            file        Logfile or path of the logfile to stop mirroring to
 
         Returns:
             None
@@ -260,9 +400,43 @@ class Logger:
         else:
             Logger.tee.close(file)
 
+    def flush_logfiles() -> None:
+        '''
+        Flushes pending output of all logfiles the Logger currently mirrors to. This
+        is called after each test and is registered as an exit event, as the Tee object
+        does not flush logfiles on its own.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        '''
+        if Logger.tee is not None:
+            Logger.tee.flush_files()
+
+    def close_logfiles() -> None:
+        '''
+        Closes all logfiles and restores sys.stdout. This is only required when tricot
+        is used as a library and output should no longer be mirrored to any logfile.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        '''
+        if Logger.tee is None:
+            return
+
+        Logger.flush_batch()
+        Logger.tee.detach()
+        Logger.tee = None
+
     def enable_stdout() -> None:
         '''
-        Enables stdout on the loggers tee object.
+        Enables stdout on the loggers tee object. Pending batched output is
+        written before, as it was created while stdout was disabled.
 
         Parameters:
             None
@@ -273,11 +447,13 @@ class Logger:
         if Logger.tee is None:
             return
 
+        Logger.flush_batch()
         Logger.tee.enable_stdout()
 
     def disable_stdout() -> None:
         '''
-        Disables stdout on the loggers tee object.
+        Disables stdout on the loggers tee object. Pending batched output is
+        written before, as it was created while stdout was enabled.
 
         Parameters:
             None
@@ -288,6 +464,7 @@ class Logger:
         if Logger.tee is None:
             return
 
+        Logger.flush_batch()
         Logger.tee.disable_stdout()
 
     def extract_warning(e: Exception, ext: Extractor) -> None:
@@ -301,6 +478,8 @@ class Logger:
         Returns:
             None
         '''
+        msg = str(e)
+
         Logger.increase_indent()
         Logger.print_plain('')
 
@@ -311,7 +490,7 @@ class Logger:
         else:
             Logger.print_yellow('Warning:', end=' ')
             Logger.print_mixed_blue_plain('Extractor', ext.name, 'caused an unexpected exception:')
-            Logger.print_yellow(str(e))
+            Logger.print_yellow(msg)
 
         Logger.print('', end='  --> ')
         Logger.decrease_indent()
@@ -322,12 +501,14 @@ class Logger:
         logging. It is basically a wrapper around '_handle_error', which
         performs the real error handling.
         '''
-        Logger.increase_indent()
-        Logger._handle_error(e, val)
-        Logger.decrease_indent()
+        with Logger.batched():
+
+            Logger.increase_indent()
+            Logger._handle_error(e, val)
+            Logger.decrease_indent()
 
-        if Logger.verbosity != 0:
-            Logger.print('', e=True)
+            if Logger.verbosity != 0:
+                Logger.print('', e=True)
 
     def _handle_error(e: Exception, val: Validator) -> None:
         '''
@@ -335,6 +516,8 @@ class Logger:
         Depending on the current 'verbosity' level, a different amount of information
         is printed.
         '''
+        msg = str(e)
+
         if Logger.verbosity == 0:
             Logger.disable_stdout()
 
@@ -347,12 +530,12 @@ class Logger:
                 Logger.print('', e=True)
 
             Logger.print('  Extractor failed because of the following reason:', e=True)
-            Logger.print_with_indent_blue('  ' + str(e), e=True)
+            Logger.print_with_indent_blue('  ' + msg, e=True)
 
         elif type(e) is ValidatorError:
             Logger.print_mixed_red('- Caught', 'ValidatorError', 'during validator instantiation.', e=True)
             Logger.print('  Validator instantiation failed because of the following reason:', e=True)
-            Logger.print_blue('  ' + str(e), e=True)
+            Logger.print_blue('  ' + msg, e=True)
             Logger.enable_stdout()
             return
 
@@ -365,13 +548,13 @@ class Logger:
                 Logger.print('', e=True)
 
             Logger.print('  Validator run failed because of the following reason:', e=True)
-            Logger.print_with_indent_blue('  ' + str(e), e=True)
+            Logger.print_with_indent_blue('  ' + msg, e=True)
 
         else:
             Logger.print_mixed_yellow('- Caught unexpected', type(e).__name__, 'during validation process.', e=True)
             Logger.print_mixed_red('  The', val.name, 'validator raises probably an uncaught exception.', e=True)
             Logger.print_mixed_blue('  Configuration file:', val.path.resolve().absolute(), e=True)
-            Logger.print_mixed_blue('  Message:', str(e), e=True)
+            Logger.print_mixed_blue('  Message:', msg, e=True)
 
         if Logger.verbosity <= 1:
             Logger.disable_stdout()
@@ -380,7 +563,7 @@ class Logger:
         Logger.print_yellow('  Command:', e=True, end=' ')
         Logger.print_plain(val.command.command)
         Logger.print_yellow('  Command exit code:', end=' ', e=True)
-        cprint(val.command.status, color='blue')
+        Logger.print_plain_blue(val.command.status)
 
         Logger.print_yellow('  Command stdout:', e=True)
         if val.command.stdout:
@@ -397,12 +580,12 @@ class Logger:
         if type(e) is ExtractException:
             Logger.print_yellow('  Extractor parameters:', e=True)
             Logger.increase_indent()
-            Logger.print_with_indent(json.dumps(e.extractor.param, indent=4).replace(r'\n', '\n').replace(r'\t', '\t'), e=True)
+            Logger.print_with_indent(dump_json(e.extractor.param), e=True)
 
         else:
             Logger.print_yellow('  Validator parameters:', e=True)
             Logger.increase_indent()
-            Logger.print_with_indent(json.dumps(val.param, indent=4).replace(r'\n', '\n').replace(r'\t', '\t'), e=True)
+            Logger.print_with_indent(dump_json(val.param), e=True)
 
         Logger.decrease_indent()
         Logger.enable_stdout()
@@ -410,77 +593,96 @@ class Logger:
     def handle_success(cmd: Command, val: list[Validator]) -> None:
         '''
         This function is called when all Validators have been passed.
-        It is basically a wrapper around '_handle_success'.
+        It is basically a wrapper around '_handle_success'. The output is
+        only written to stdout when running with verbosity level 3.
         '''
         if Logger.tee is None:
             return
 
-        if Logger.verbosity != 3:
-            Logger.disable_stdout()
-
         Logger.increase_indent()
-        Logger._handle_success(cmd, val)
+        lines = Logger._handle_success(cmd, val)
         Logger.decrease_indent()
-        Logger.print('')
-        Logger.enable_stdout()
 
-    def _handle_success(cmd: Command, val: list[Validator]) -> None:
+        lines.append(Logger.get_prefix(False) + ' \n')
+        Logger.flush_batch()
+        Logger.tee.writev(lines, stdout=Logger.verbosity == 3)
+
+    def _handle_success(cmd: Command, val: list[Validator]) -> list[str]:
         '''
-        This functions handles Exceptions that are raised by validators.
-        Depending on the current 'verbosity' level, a different amount of information
-        is printed.
+        This functions formats the debug output for successful tests. The output is
+        not printed directly, but returned as a list of lines, that can be emitted
+        in one go.
         '''
-        Logger.print_mixed_yellow('-', 'Debug output:')
+        colorize = Logger.colorize
+        format_with_indent = Logger.format_with_indent
+
+        lines = [f"{Logger.get_prefix(False)} - {colorize('Debug output:', 'yellow')}\n"]
+
         Logger.increase_indent()
-        Logger.print_yellow('Command:', end=' ')
-        Logger.print_plain(cmd.command)
-        Logger.print_yellow('Command exit code:', end=' ')
-        cprint(cmd.status, color='blue')
+        prefix = Logger.get_prefix(False) + ' '
 
-        Logger.print_yellow('Command stdout:')
+        lines.append(f"{prefix}{colorize('Command:', 'yellow')} {cmd.command}\n")
+        lines.append(f"{prefix}{colorize('Command exit code:', 'yellow')} {colorize(cmd.status, 'blue')}\n")
+
+        lines.append(f"{prefix}{colorize('Command stdout:', 'yellow')}\n")
         if cmd.stdout:
             Logger.increase_indent()
-            Logger.print_with_indent(cmd.stdout)
+            lines += format_with_indent(cmd.stdout)
             Logger.decrease_indent()
 
-        Logger.print_yellow('Command stderr:')
+        lines.append(f"{prefix}{colorize('Command stderr:', 'yellow')}\n")
         if cmd.stderr:
             Logger.increase_indent()
-            Logger.print_with_indent(cmd.stderr)
+            lines += format_with_indent(cmd.stderr)
             Logger.decrease_indent()
 
-        Logger.print_yellow('Validators:')
+        lines.append(f"{prefix}{colorize('Validators:', 'yellow')}\n")
         Logger.increase_indent()
+        prefix = Logger.get_prefix(False) + ' '
+
         for validator in val:
-            Logger.print_yellow('Validator name:', end=' ')
-            cprint(validator.name, color='blue')
-            Logger.print_yellow('Validator parameters:')
-            Logger.increase_indent()
-            Logger.print_with_indent(json.dumps(validator.param, indent=4).replace(r'\n', '\n').replace(r'\t', '\t'))
-            Logger.decrease_indent()
+            lines.append(f"{prefix}{colorize('Validator name:', 'yellow')} {colorize(validator.name, 'blue')}\n")
+            lines.append(f"{prefix}{colorize('Validator parameters:', 'yellow')}\n")
+            Logger.indent += 1
+            lines += format_with_indent(dump_json(validator.param))
+            Logger.indent -= 1
 
         Logger.decrease_indent()
         Logger.decrease_indent()
 
+        return lines
+
+
+atexit.register(Logger.flush_logfiles)
+
 
 class Tee(object):
     '''
     Helper class to log stdout to a file. Copied from:
     https://stackoverflow.com/questions/616645/how-to-duplicate-sys-stdout-to-a-log-file
+
+    Logfiles are reference counted by their name, so that nested testers and tests
+    that use the same logfile share one file object, which is closed when the last
+    of them stops mirroring to it. Output to logfiles is buffered and is only written
+    when the buffer is full, when the Logger flushes the logfiles after a test, when
+    the logfile is closed or when the interpreter exits.
     '''
+    __slots__ = ('files', 'refs', 'stdout', 'use_stdout')
 
-    def __init__(self, file: typing.TextIO) -> None:
+    def __init__(self, file: typing.Union[typing.TextIO, str]) -> None:
         '''
         Create a new Tee object that is used to duplicate output to log files.
 
         Parameters:
-            file        Logfile to mirror output to
+            file        Logfile or path of the logfile to mirror output to
 
         Returns:
             None
         '''
-        self.file_names = [file.name]
-        self.files = [file]
+        self.files = {}
+        self.refs = {}
+        self.add(file)
+
         self.stdout = sys.stdout
         self.use_stdout = True
         sys.stdout = self
@@ -495,10 +697,28 @@ class Tee(object):
         Returns:
             None
         '''
-        sys.stdout = self.stdout
-        for file in self.files:
+        self.detach()
+
+    def detach(self) -> None:
+        '''
+        Set sys.stdout back to the stream that was replaced by the Tee object (if the
+        Tee object is still installed) and close all logfiles.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        '''
+        if sys.stdout is self:
+            sys.stdout = self.stdout
+
+        for file in self.files.values():
             file.close()
 
+        self.files.clear()
+        self.refs.clear()
+
     def write(self, data) -> None:
         '''
         Write output to stdout if 'use_stdout' is True. Furthermore, write
@@ -512,12 +732,57 @@ class Tee(object):
         '''
         if self.use_stdout:
             self.stdout.write(data)
-        for file in self.files:
+        for file in self.files.values():
             file.write(data)
 
+    def writev(self, chunks: list[str], stdout: bool = True) -> None:
+        '''
+        Write a list of strings to stdout (if 'use_stdout' is True) and to
+        all open logfiles. See the module level writev function for details.
+        Logfiles are written through their buffer instead, as the writev function
+        flushes the stream first. Setting 'stdout' to False skips stdout for this
+        call only.
+
+        Parameters:
+            chunks      List of strings to write
+            stdout      Whether to write to stdout
+
+        Returns:
+            None
+        '''
+        if stdout and self.use_stdout:
+            writev(self.stdout, chunks)
+        for file in self.files.values():
+            file.writelines(chunks)
+
+    def write_bytes(self, data: bytes) -> None:
+        '''
+        Write UTF-8 encoded output to stdout if 'use_stdout' is True and to
+        all open logfiles. On stdout, the data is written to the underlying file
+        descriptor directly. See the module level write_bytes function for details.
+        Logfiles are written through their buffer instead, as the write_bytes function
+        flushes the stream first.
+
+        Parameters:
+            data        UTF-8 encoded data to write
+
+        Returns:
+            None
+        '''
+        if self.use_stdout:
+            write_bytes(self.stdout, data)
+
+        if self.files:
+
+            text = data.decode('utf-8')
+
+            for file in self.files.values():
+                file.write(text)
+
     def flush(self) -> None:
         '''
-        Flusth pending output on all files.
+        Flush pending output on stdout. Logfiles are not flushed here, so that
+        their output is written in large chunks.
 
         Parameters:
             None
@@ -525,40 +790,67 @@ class Tee(object):
         Returns:
             None
         '''
-        for file in self.files:
-            file.flush()
+        if self.use_stdout:
+            self.stdout.flush()
 
-    def add(self, file: typing.TextIO) -> None:
+    def flush_files(self) -> None:
         '''
-        Add a new logfile where output is mirrored to.
+        Flush pending output on all logfiles.
 
         Parameters:
-            file        File to mirror output to
+            None
 
         Returns:
             None
         '''
-        if file.name not in self.file_names:
-            self.file_names.append(file.name)
-            self.files.append(file)
+        for file in self.files.values():
+            file.flush()
 
-    def close(self, file: typing.TextIO) -> None:
+    def add(self, file: typing.Union[typing.TextIO, str]) -> None:
         '''
-        Close a logfile and stop mirroring data to it.
+        Add a new logfile where output is mirrored to. If a path is specified,
+        the logfile is opened with a large buffer. If output is already mirrored
+        to a logfile with the same name, only its reference count is increased.
 
         Parameters:
+            file        File or path of the file to mirror output to
+
+        Returns:
             None
+        '''
+        name = file if type(file) is str else file.name
+
+        if name in self.files:
+            self.refs[name] += 1
+            return
+
+        if type(file) is str:
+            file = open(file, 'w', buffering=LOGFILE_BUFFER)
+
+        self.files[name] = file
+        self.refs[name] = 1
+
+    def close(self, file: typing.Union[typing.TextIO, str]) -> None:
+        '''
+        Stop mirroring data to a logfile. The logfile is closed when no test or
+        tester mirrors to it anymore.
+
+        Parameters:
+            file        File or path of the file to stop mirroring to
 
         Returns:
             None
         '''
-        if file.name not in self.file_names:
+        name = file if type(file) is str else file.name
+
+        if name not in self.refs:
             return
 
-        self.file_names.remove(file.name)
-        c_file = next(filter(lambda x: x.name == file.name, self.files))
-        c_file.close()
-        self.files.remove(c_file)
+        self.refs[name] -= 1
+
+        if self.refs[name] == 0:
+            del self.refs[name]
+            self.files.pop(name).close()
 
     def enable_stdout(self) -> None:
         '''
@@ -587,3 +879,123 @@ class Tee(object):
             None
         '''
         self.use_stdout = False
+
+
+def writev(stream: typing.TextIO, chunks: list[str]) -> None:
+    '''
+    Writes a list of strings to the specified stream. If the overall size exceeds
+    WRITEV_THRESHOLD and the stream is backed by a file descriptor, the chunks are
+    written using os.writev. This avoids joining large outputs (e.g. command output)
+    into one big string and reduces the number of write syscalls. Smaller outputs
+    are just joined and written, as this is usually faster than the writev call.
+
+    Parameters:
+        stream      Stream to write to
+        chunks      List of strings to write
+
+    Returns:
+        None
+    '''
+    if sum(map(len, chunks)) < WRITEV_THRESHOLD:
+        stream.write(''.join(chunks))
+        return
+
+    try:
+        fd = stream.fileno()
+
+    except (AttributeError, OSError, ValueError):
+        stream.write(''.join(chunks))
+        return
+
+    encoding = getattr(stream, 'encoding', None) or 'utf-8'
+    errors = getattr(stream, 'errors', None) or 'strict'
+    buffers = [chunk.encode(encoding, errors) for chunk in chunks]
+
+    stream.flush()
+    index = 0
+
+    while index < len(buffers):
+
+        written = os.writev(fd, buffers[index:index + IOV_MAX])
+
+        while index < len(buffers) and written >= len(buffers[index]):
+            written -= len(buffers[index])
+            index += 1
+
+        if written:
+            buffers[index] = buffers[index][written:]
+
+
+def write_bytes(stream: typing.TextIO, data: bytes) -> None:
+    '''
+    Writes UTF-8 encoded data to the file descriptor of the specified stream. This
+    bypasses the encoding and locking of the text layer. Pending output of the stream
+    is flushed before. If the stream is not backed by a file descriptor or uses a
+    different encoding, the data is decoded and written to the stream as usual.
+
+    Parameters:
+        stream      Stream to write to
+        data        UTF-8 encoded data to write
+
+    Returns:
+        None
+    '''
+    try:
+        fd = stream.fileno()
+
+        if codecs.lookup(getattr(stream, 'encoding', None) or 'utf-8').name != 'utf-8':
+            raise ValueError('Stream does not use UTF-8 encoding')
+
+    except (AttributeError, LookupError, OSError, ValueError):
+        stream.write(data.decode('utf-8'))
+        return
+
+    stream.flush()
+    view = memoryview(data)
+
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def can_colorize() -> bool:
+    '''
+    Checks whether colored output should be used. The checks are the same as
+    performed by termcolor, which was previously used for all colored output.
+
+    Parameters:
+        None
+
+    Returns:
+        bool        True if colors should be used
+    '''
+    if os.environ.get('ANSI_COLORS_DISABLED') or os.environ.get('NO_COLOR'):
+        return False
+
+    if os.environ.get('FORCE_COLOR'):
+        return True
+
+    if os.environ.get('TERM') == 'dumb':
+        return False
+
+    try:
+        return os.isatty(sys.stdout.fileno())
+
+    except (AttributeError, OSError, ValueError):
+        return False
+
+
+def dump_json(obj: typing.Any) -> str:
+    '''
+    Returns an indented JSON representation of the specified object. Escaped
+    newlines and tabs are converted back into their literal form, to keep
+    multi line values readable. This is done in one pass over the string.
+
+    Parameters:
+        obj         Object to dump
+
+    Returns:
+        str         JSON representation of the object
+    '''
+    import json
+
+    return JSON_ESCAPES.sub(lambda m: JSON_UNESCAPE[m.group(0)], json.dumps(obj, indent=4))
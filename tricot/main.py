@@ -37,6 +37,7 @@ parser.add_argument('--exclude-ids', dest='eids', metavar='id', nargs='+', defau
 parser.add_argument('--exclude-groups', dest='egroups', metavar='group', nargs='+', default=[], help='exclude the specified test groups')
 parser.add_argument('file', metavar='file', nargs='+', help='test definition (.yml file)')
 parser.add_argument('--groups', metavar='group', nargs='+', default=[], help='only run the specified test groups')
+parser.add_argument('--hash-cache', dest='hash_cache', action='store_true', help='cache checksums of required files')
 parser.add_argument('--ids', metavar='id', nargs='+', default=[], help='only run the specified test / tester IDs')
 parser.add_argument('--logfile', dest='log', metavar='file', type=argparse.FileType('w'), help='mirror output into a logfile')
 parser.add_argument('--load', dest='load', metavar='file', nargs='+', default=[], type=argparse.FileType('r'), help='custom validators, extractors and plugins')
@@ -183,9 +184,14 @@ def main():
     if args.template:
         write_template(args.file[0], args.template)
 
+    if args.hash_cache:
+        tricot.resource.HASH_CACHE = tricot.resource.DEFAULT_HASH_CACHE
+
     load(args.load)
     variables = prepare_variables(args)
 
+    ids = set(args.ids)
+    eids = set(args.eids)
     groups = tricot.utils.parse_groups(args.groups)
     egroups = tricot.utils.parse_groups(args.egroups)
 
@@ -201,8 +207,8 @@ def main():
 
         try:
             tester = tricot.Tester.from_file(yml_file, runtime_vars=variables)
-            tester.filter_tests(set(args.ids), groups, set(args.eids), egroups)
-            tester.filter_testers(set(args.ids), groups, set(args.eids), egroups)
+            tester.filter_tests(ids, groups, eids, egroups)
+            tester.filter_testers(ids, groups, eids, egroups)
             tester.check_requirements()
             tester.run()
 
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 import os
-import sys
+import stat
 import time
+import errno
 import shutil
 import signal
 import atexit
-import socket
+import selectors
 import functools
 import threading
 import subprocess
@@ -17,8 +18,8 @@ from pathlib import Path
 import tricot.utils
 
 
-this = sys.modules[__name__]
-this.plugins = {}
+plugins: dict[str, type] = {}
+running_plugins: dict[Plugin, None] = {}
 
 
 def register_plugin(plugin_name: str, plugin_class: type) -> None:
@@ -35,7 +36,7 @@ def register_plugin(plugin_name: str, plugin_class: type) -> None:
     Returns:
         None
     '''
-    this.plugins[plugin_name] = plugin_class
+    plugins[plugin_name] = plugin_class
 
 
 def get_plugin(path: Path, plugin_name: str, param: Any, variables: dict[str:str]) -> Plugin:
@@ -51,7 +52,7 @@ def get_plugin(path: Path, plugin_name: str, param: Any, variables: dict[str:str
         param               Params to initialize the plugin with
         variables           Variables to initialize the plugin with
     '''
-    plug_class = this.plugins.get(plugin_name)
+    plug_class = plugins.get(plugin_name)
 
     if plug_class is None:
         raise PluginError(path, f"Unable to find specified plugin '{plugin_name}'.")
@@ -69,8 +70,35 @@ def get_plugin_list() -> list[str]:
     Returns:
         plugin_list       List of registred plugins
     '''
-    keys = this.plugins.keys()
-    return list(keys)
+    return list(plugins)
+
+
+def stop_plugins() -> None:
+    '''
+    Stops all plugins that are still running when tricot exits. Plugins are stopped in
+    the reverse order they were started in. Exceptions raised by a plugin are logged and
+    do not prevent the remaining plugins from being stopped.
+
+    The function is registered as atexit handler when a plugin is started while no other
+    plugin is running. As atexit handlers run in reverse order, plugins are stopped before
+    the containers that were created before them.
+
+    Parameters:
+        None
+
+    Returns:
+        None
+    '''
+    for plugin in reversed(list(running_plugins)):
+
+        try:
+            plugin._stop()
+
+        except PluginException as e:
+            tricot.Logger.print_mixed_yellow('Caught', 'PluginException', 'from', end='', e=True)
+            tricot.Logger.print_mixed_blue_plain('', e.name, 'plugin in', end=' ')
+            tricot.Logger.print_yellow_plain(e.path.absolute())
+            tricot.Logger.print_mixed_blue('Original exception:', f'{type(e.original).__name__} - {e.original}')
 
 
 class PluginException(Exception):
@@ -140,6 +168,22 @@ class Plugin:
     '''
     param_type = None
     inner_types = None
+    inner_specs = ()
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        '''
+        Precomputes the 'inner_specs' of a Plugin class. When 'inner_types' is a dict,
+        'inner_specs' contains a (key, required, type) tuple for each of its items. This
+        saves the lookups within the specification dicts on each plugin initialization.
+        When 'inner_types' is a list, 'inner_specs' contains the allowed types as frozenset.
+        '''
+        super().__init_subclass__(**kwargs)
+
+        if type(cls.inner_types) is dict:
+            cls.inner_specs = tuple((key, spec['required'], spec['type']) for key, spec in cls.inner_types.items())
+
+        elif type(cls.inner_types) is list:
+            cls.inner_specs = frozenset(cls.inner_types)
 
     def __init__(self, path: Path, name: str, param: Any, variables: dict[str, Any]) -> None:
         '''
@@ -152,6 +196,7 @@ class Plugin:
             variables   Variables contained in this dict are replaced in all str parameters
         '''
         self.path = path
+        self.cwd = path.parent
         self.name = name
         self.param = param
         self.variables = variables
@@ -198,21 +243,21 @@ class Plugin:
         '''
         if type(self.param) is dict and type(self.inner_types) is dict:
 
-            for key, value in self.inner_types.items():
+            for key, required, expected in self.inner_specs:
 
                 param = self.param.get(key)
-                if value['required'] and not param:
-                    message = f"Plugin '{self.name}' requires key with name '{key}' and type {value['type']}."
+                if required and not param:
+                    message = f"Plugin '{self.name}' requires key with name '{key}' and type {expected}."
                     raise PluginError(self.path, message)
 
-                if param is not None and type(param) is not value['type']:
-                    message = f"Plugin '{self.name}' expects type {value['type']} for the '{key}' key."
+                if param is not None and type(param) is not expected:
+                    message = f"Plugin '{self.name}' expects type {expected} for the '{key}' key."
                     raise PluginError(self.path, message)
 
         elif type(self.param) is list and type(self.inner_types) is list:
 
             for param in self.param:
-                if type(param) not in self.inner_types:
+                if type(param) not in self.inner_specs:
                     message = f"Plugin '{self.name}' requires a parameter type of list[{str(self.inner_types)}."
                     raise PluginError(self.path, message)
 
@@ -257,7 +302,12 @@ class Plugin:
             None
         '''
         self.stopped = False
-        atexit.register(self._stop)
+
+        if not running_plugins:
+            atexit.unregister(stop_plugins)
+            atexit.register(stop_plugins)
+
+        running_plugins[self] = None
         self.param = tricot.utils.apply_variables(self.param, hotplug_variables)
 
         try:
@@ -296,16 +346,18 @@ class Plugin:
             self.stopped = True
 
         except Exception as e:
-            atexit.unregister(self._stop)
             raise PluginException(e, self.name, self.path)
 
+        finally:
+            running_plugins.pop(self, None)
+
     def stop(self) -> None:
         '''
         Dummy stop method. If a Plugin requires cleanup, this method should be overwritten.
         '''
         return None
 
-    def resolve_path(self, path: str) -> str:
+    def resolve_path(self, path: str) -> Path:
         '''
         Resolves the specified path relative to the current plugin definition (file location of
         the plugins .yml file). If the input path is already absolute, it is just returned.
@@ -316,10 +368,12 @@ class Plugin:
         Returns:
             resolved    Resolved file system path
         '''
-        if os.path.isabs(path):
-            return Path(path)
+        path = Path(path)
+
+        if path.is_absolute():
+            return path
 
-        return self.path.parent.joinpath(path)
+        return self.cwd / path
 
 
 class OsCommandPlugin(Plugin):
@@ -349,17 +403,25 @@ class OsCommandPlugin(Plugin):
 
     def on_exit(self, command) -> None:
         '''
-        Just a helper function that is called when a process exited.
+        Just a helper function that is called when a process exited. The process
+        is either a still running Popen object or an already CompletedProcess.
         '''
         ignore_error = self.param.get('ignore_error', False)
-        poll = self.process.poll()
+
+        if type(self.process) is subprocess.CompletedProcess:
+            poll = self.process.returncode
+            output = (self.process.stdout, self.process.stderr)
+
+        else:
+            poll = self.process.poll()
+            output = None
 
         if poll and poll != 0 and not ignore_error:
 
             if type(command) is list:
                 command = ' '.join(command)
 
-            stdout, stderr = self.process.communicate()
+            stdout, stderr = output or self.process.communicate()
 
             raise OSError(f"Command '{command}' exited with a non zero status code." +
                           f"\n\nstdout: {stdout}\n\nstderr: {stderr}")
@@ -375,20 +437,22 @@ class OsCommandPlugin(Plugin):
         timeout = self.param.get('timeout', 0)
         background = self.param.get('background', False)
 
-        for ctr in range(len(command)):
-            command[ctr] = str(command[ctr])
+        command = list(map(str, command))
 
         if shell:
             command = ' '.join(command)
 
-        self.process = subprocess.Popen(command, cwd=self.path.parent, stdout=subprocess.PIPE,
-                                        stderr=subprocess.STDOUT, shell=shell, preexec_fn=os.setsid)
+        if background or timeout > 0:
+
+            self.process = subprocess.Popen(command, cwd=self.cwd, stdout=subprocess.PIPE,
+                                            stderr=subprocess.STDOUT, shell=shell, start_new_session=True)
 
-        if timeout > 0:
-            self.process.communicate(timeout=timeout)
+            if timeout > 0:
+                self.process.communicate(timeout=timeout)
 
-        elif not background:
-            self.process.wait()
+        else:
+            self.process = subprocess.run(command, cwd=self.cwd, stdout=subprocess.PIPE,
+                                          stderr=subprocess.STDOUT, shell=shell, start_new_session=True)
 
         if init > 0:
             time.sleep(init)
@@ -431,34 +495,43 @@ class MkdirPlugin(Plugin):
                     'dirs': {'required': True, 'type': list}
                   }
 
-    blacklist = ['/', '/home', '/opt', '/var']
-    directories = list()
+    blacklist = frozenset(map(Path, ['/', '/home', '/opt', '/var']))
+    directories = set()
+
+    def __init__(self, *args, **kwargs) -> None:
+        '''
+        Initialize the list of directories that are cleaned up by this plugin instance.
+        The class wide 'directories' set tracks directories that are already scheduled
+        for cleanup by any MkdirPlugin.
+        '''
+        super().__init__(*args, **kwargs)
+        self.created = []
 
     def run(self) -> None:
         '''
         Create the specified directories if not already existing.
         '''
+        cleanup = self.param.get('cleanup', False)
+
         for directory in self.param['dirs']:
 
             directory = self.resolve_path(directory)
-            os.makedirs(directory, exist_ok=True)
 
-            if directory not in MkdirPlugin.directories:
-                MkdirPlugin.directories.append(directory)
+            if not directory.is_dir():
+                os.makedirs(directory, exist_ok=True)
 
-                if self.directories is None:
-                    self.directories = []
-
-                self.directories.append(directory)
+            if cleanup and directory not in MkdirPlugin.directories:
+                MkdirPlugin.directories.add(directory)
+                self.created.append(directory)
 
     def stop(self) -> None:
         '''
         Remove all directories created by the plugin (only if cleanup is set to true).
         '''
-        if not self.param.get('cleanup', False) or not hasattr(self, 'directories'):
+        if not self.param.get('cleanup', False):
             return
 
-        for directory in self.directories:
+        for directory in self.created:
             if directory not in MkdirPlugin.blacklist:
 
                 try:
@@ -466,11 +539,105 @@ class MkdirPlugin(Plugin):
 
                 except OSError as e:
 
-                    if 'not empty' in str(e) and self.param.get('force', False):
+                    if e.errno in (errno.ENOTEMPTY, errno.EEXIST) and self.param.get('force', False):
                         shutil.rmtree(directory)
 
-                MkdirPlugin.directories.remove(directory)
-                self.directories.remove(directory)
+            MkdirPlugin.directories.discard(directory)
+
+        self.created = []
+
+
+class HttpListenerManager:
+    '''
+    The HttpListenerManager serves the HTTP servers of all HttpListenerPlugins from a
+    single background thread. The listening sockets are registered on a selector and
+    connections are accepted by the server whose socket became readable. Requests are
+    processed in a separate thread per request (ThreadingHTTPServer), so that a slow
+    client cannot block other listeners or the unregistration of a server. The thread
+    is started when the first server is registered and exits when no servers are left.
+    '''
+    poll_interval = 0.5
+
+    def __init__(self) -> None:
+        '''
+        Initializes the selector and the lock that protects it.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        '''
+        self.lock = threading.Lock()
+        self.thread = None
+        self.selector = selectors.DefaultSelector()
+
+    def register(self, server: http.server.ThreadingHTTPServer) -> None:
+        '''
+        Starts serving the specified server. The server timeout is set to zero, so that
+        the serving thread does not wait for a connection that vanished before it was
+        accepted. The server should process requests in separate threads.
+
+        Parameters:
+            server      Already bound ThreadingHTTPServer to serve
+
+        Returns:
+            None
+        '''
+        server.timeout = 0
+
+        with self.lock:
+            self.selector.register(server, selectors.EVENT_READ, server)
+
+            if self.thread is None:
+                self.thread = threading.Thread(name='http-listener', target=self.serve, daemon=True)
+                self.thread.start()
+
+    def unregister(self, server: http.server.ThreadingHTTPServer) -> None:
+        '''
+        Stops serving the specified server and closes it. When this method returns, no
+        new connections are accepted by the server. Requests that are already being
+        processed are not waited for.
+
+        Parameters:
+            server      ThreadingHTTPServer to stop
+
+        Returns:
+            None
+        '''
+        with self.lock:
+            self.selector.unregister(server)
+            server.server_close()
+
+    def serve(self) -> None:
+        '''
+        Serves requests of all registered servers until no server is left. Should be
+        run in a separate thread.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        '''
+        while True:
+
+            with self.lock:
+
+                if not self.selector.get_map():
+                    self.thread = None
+                    return
+
+            events = self.selector.select(self.poll_interval)
+
+            with self.lock:
+
+                registered = self.selector.get_map()
+
+                for key, _ in events:
+
+                    if registered.get(key.fd) is key:
+                        key.data.handle_request()
 
 
 class HttpListenerPlugin(Plugin):
@@ -490,7 +657,8 @@ class HttpListenerPlugin(Plugin):
                     'port': {'required': True, 'type': int},
                     'dir': {'required': True, 'type': str}
                   }
-    instances = []
+    instances = {}
+    manager = HttpListenerManager()
 
     def __init__(self, *args, **kwargs) -> None:
         '''
@@ -516,6 +684,8 @@ class HttpListenerPlugin(Plugin):
     def run(self) -> None:
         '''
         Checks whether a server on this port is already running and starts it otherwise.
+        The server socket is bound before it is handed to the HttpListenerManager, so the
+        listener accepts connections as soon as this method returns.
         '''
         port = self.param['port']
         directory = self.param['dir']
@@ -527,42 +697,22 @@ class HttpListenerPlugin(Plugin):
         if not directory.is_dir():
             raise FileNotFoundError(f"Specified directory '{directory.absolute()}' does not exist.")
 
-        self.thread = threading.Thread(name=f'http-{port}', target=self.start_server, args=(port, directory))
-        self.thread.setDaemon(True)
-        self.thread.start()
-
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        while sock.connect_ex(('127.0.0.1', port)) != 0:
-            time.sleep(0.1)
-        sock.close()
-
-        HttpListenerPlugin.instances.append(port)
-
-    def start_server(self, port: int, directory: str) -> None:
-        '''
-        Starts the HTTPListener. Should be run in a separate thread.
-        '''
-        try:
-            handler = functools.partial(HttpListenerPlugin.CustomHandler, directory=directory)
-            self.server = http.server.HTTPServer(('', port), handler)
-            self.server.serve_forever()
+        handler = functools.partial(HttpListenerPlugin.CustomHandler, directory=directory)
+        self.server = http.server.ThreadingHTTPServer(('', port), handler)
+        HttpListenerPlugin.manager.register(self.server)
 
-        except Exception:
-            pass
+        HttpListenerPlugin.instances[port] = self
 
     def stop(self) -> None:
         '''
-        Stops the HTTPListener and the corresponding thread.
+        Stops the HTTPListener.
         '''
         if hasattr(self, 'server') and self.server:
-            self.server.server_close()
-            self.server.shutdown()
-
-        if hasattr(self, 'thread') and self.thread:
-            self.thread.join()
+            HttpListenerPlugin.manager.unregister(self.server)
+            self.server = None
 
-        if self.param['port'] in HttpListenerPlugin.instances:
-            HttpListenerPlugin.instances.remove(self.param['port'])
+        if HttpListenerPlugin.instances.get(self.param['port']) is self:
+            HttpListenerPlugin.instances.pop(self.param['port'])
 
 
 class CleanupPlugin(Plugin):
@@ -585,34 +735,43 @@ class CleanupPlugin(Plugin):
                     'items': {'required': True, 'type': list}
                   }
 
-    blacklist = ['/', '/home', '/opt', '/var']
+    blacklist = frozenset(map(Path, ['/', '/home', '/opt', '/var']))
 
     def stop(self) -> None:
         '''
         Remove all items specified in the plugin definition.
         '''
+        force = self.param.get('force', False)
+
         for item in self.param.get('items', []):
 
             item = self.resolve_path(item)
+
+            if item in CleanupPlugin.blacklist:
+                continue
+
             try:
+                os.unlink(item)
+                continue
 
-                if item in CleanupPlugin.blacklist:
-                    continue
+            except FileNotFoundError:
+                continue
 
-                elif os.path.isdir(item):
+            except IsADirectoryError:
+                pass
 
-                    try:
-                        os.rmdir(item)
+            except PermissionError:
 
-                    except OSError as e:
-                        if 'not empty' in str(e) and self.param.get('force', False):
-                            shutil.rmtree(item)
+                if not os.path.isdir(item):
+                    raise
 
-                else:
-                    os.remove(item)
+            try:
+                os.rmdir(item)
 
-            except FileNotFoundError:
-                continue
+            except OSError as e:
+
+                if e.errno in (errno.ENOTEMPTY, errno.EEXIST) and force:
+                    shutil.rmtree(item)
 
 
 class CleanupCommandPlugin(Plugin):
@@ -642,14 +801,14 @@ class CleanupCommandPlugin(Plugin):
         Just a helper function that is called when a process exited.
         '''
         ignore_error = self.param.get('ignore_error', False)
-        poll = self.process.poll()
+        poll = self.process.returncode
 
         if poll and poll != 0 and not ignore_error:
 
             if type(command) is list:
                 command = ' '.join(command)
 
-            stdout, stderr = self.process.communicate()
+            stdout, stderr = self.process.stdout, self.process.stderr
 
             raise OSError(f"Command '{command}' exited with a non zero status code." +
                           f"\n\nstdout: {stdout}\n\nstderr: {stderr}")
@@ -662,20 +821,13 @@ class CleanupCommandPlugin(Plugin):
         shell = self.param.get('shell', False)
         timeout = self.param.get('timeout', 0)
 
-        for ctr in range(len(command)):
-            command[ctr] = str(command[ctr])
+        command = list(map(str, command))
 
         if shell:
             command = ' '.join(command)
 
-        self.process = subprocess.Popen(command, cwd=self.path.parent, stdout=subprocess.PIPE,
-                                        stderr=subprocess.STDOUT, shell=shell)
-
-        if timeout > 0:
-            self.process.communicate(timeout=timeout)
-
-        else:
-            self.process.wait()
+        self.process = subprocess.run(command, cwd=self.cwd, stdout=subprocess.PIPE,
+                                      stderr=subprocess.STDOUT, shell=shell, timeout=timeout or None)
 
         self.on_exit(command)
 
@@ -703,7 +855,7 @@ class CopyPlugin(Plugin):
                     'to': {'required': True, 'type': list}
                   }
 
-    blacklist = ['/', '/home', '/opt', '/var']
+    blacklist = frozenset(map(Path, ['/', '/home', '/opt', '/var']))
 
     def run(self) -> None:
         '''
@@ -717,16 +869,22 @@ class CopyPlugin(Plugin):
         if len(dest) != len(files):
             raise ValueError("The 'from' and 'to' parameters need to be equally sized lists.")
 
-        for ctr in range(len(files)):
+        for src, dst in zip(files, dest):
+
+            src_path = self.resolve_path(src)
+            dest_path = self.resolve_path(dst)
 
-            src_path = self.resolve_path(files[ctr])
-            dest_path = self.resolve_path(dest[ctr])
+            try:
+                mode = os.stat(src_path).st_mode
+
+            except (FileNotFoundError, NotADirectoryError):
+                continue
 
-            if src_path.is_file():
+            if stat.S_ISREG(mode):
                 created = shutil.copy(src_path, dest_path)
                 self.cleanup.append(Path(created))
 
-            elif src_path.is_dir():
+            elif stat.S_ISDIR(mode):
 
                 if dest_path.is_dir():
                     dest_path = dest_path.joinpath(src_path.name)
@@ -3,13 +3,40 @@
 from __future__ import annotations
 
 import os
+import json
 import pathlib
 import hashlib
 import requests
+import tempfile
+import requests.adapters
+import threading
+import concurrent.futures
 
 from tricot.logging import Logger
 
 
+CHUNK_SIZE = 1 << 20
+MAX_WORKERS = 8
+DOWNLOAD_TIMEOUT = 30
+
+session = requests.Session()
+session.mount('http://', requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=3))
+session.mount('https://', requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=3))
+
+HASH_CONSTRUCTORS = {
+    'sha512': hashlib.sha512,
+    'sha256': hashlib.sha256,
+    'sha1': hashlib.sha1,
+    'md5': hashlib.md5,
+}
+
+DEFAULT_HASH_CACHE = pathlib.Path(os.environ.get('XDG_CACHE_HOME') or '~/.cache').expanduser() / 'tricot' / 'resources.json'
+HASH_CACHE = None
+
+hash_cache = None
+hash_cache_lock = threading.Lock()
+
+
 class ResourceValidationException(Exception):
     '''
     '''
@@ -63,7 +90,10 @@ class Resource:
         '''
         Validates whether the resource has the correct state.
         Missing files are downloaded if url attribute was specified.
-        Files with incorrect permissions are adjusted.
+        Files with incorrect permissions are adjusted. If multiple
+        hashes are specified, only the strongest one is verified.
+        When a hash cache is configured, computed hashes are cached
+        until the file changes.
 
         Parameters:
             None
@@ -79,34 +109,255 @@ class Resource:
                 raise ResourceValidationException(f'{path}: does not exist.')
             
             Logger.print_mixed_yellow('Downloading missing resource from:', self.url)
-            r = requests.get(self.url)
-            
-            if r.status_code != 200:
-                raise ResourceValidationException(f'{self.url}: did not return 200.')
 
-            Logger.print_mixed_blue('Writing resource data to:', str(path))
-            path.write_bytes(r.content)
+            with session.get(self.url, stream=True, timeout=DOWNLOAD_TIMEOUT) as r:
 
-        if self.hash:
+                if r.status_code != 200:
+                    raise ResourceValidationException(f'{self.url}: did not return 200.')
+
+                Logger.print_mixed_blue('Writing resource data to:', str(path))
+                partial = path.with_name(path.name + '.part')
+
+                try:
+
+                    with partial.open('wb') as f:
+
+                        for chunk in r.iter_content(CHUNK_SIZE):
+                            f.write(chunk)
 
-            triggered = False
-            content = path.read_bytes()
+                    os.replace(partial, path)
 
-            for hash_type in ['md5', 'sha1', 'sha256', 'sha512']:
+                finally:
+                    partial.unlink(missing_ok=True)
+
+        if self.hash:
+
+            for hash_type in HASH_CONSTRUCTORS:
 
                 hash_value = self.hash.get(hash_type)
 
                 if hash_value is not None:
+                    break
 
-                    triggered = True
-                    computed = hashlib.new(hash_type, content).hexdigest()
+            else:
+                raise ResourceValidationException('hash attribute contains no valid hash types.')
 
-                    if computed != hash_value:
-                        raise ResourceValidationException(f'{path}: {computed} != {hash_value}')
+            stamp = file_stamp(path)
+            computed = get_cached_hash(path, hash_type, stamp)
 
-            if not triggered:
-                raise ResourceValidationException('hash attribute contains no valid hash types.')
+            if computed is None:
+
+                hasher = HASH_CONSTRUCTORS[hash_type]()
+
+                with path.open('rb') as f:
+
+                    for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                        hasher.update(chunk)
+
+                computed = hasher.hexdigest()
+                set_cached_hash(path, hash_type, computed, stamp)
+
+            if computed != hash_value:
+                raise ResourceValidationException(f'{path}: {computed} != {hash_value}')
 
         if self.mode:
             Logger.print_mixed_blue('Adjusting permissions of resource to:', self.mode)
             os.chmod(path, int(self.mode, 8))
+
+    def _validate_buffered(self) -> tuple[str, Exception]:
+        '''
+        Validates the resource and collects the output of the validation in a
+        thread local buffer instead of writing it to stdout.
+
+        Parameters:
+            None
+
+        Returns:
+            output          Output generated during the validation
+            error           Exception raised by the validation or None
+        '''
+        with Logger.batched() as buf:
+
+            try:
+                self.validate()
+                return buf.getvalue(), None
+
+            except Exception as e:
+                return buf.getvalue(), e
+
+            finally:
+                buf.seek(0)
+                buf.truncate()
+
+    def validate_all(resources: list[Resource], max_workers: int = MAX_WORKERS) -> None:
+        '''
+        Validates the specified resources. When more than one resource is specified,
+        the validation runs in a thread pool, so that downloads and hash computations
+        of different resources overlap. The output of each validation is buffered and
+        written in list order once all validations have finished. Like for sequential
+        validation, output stops at the first failed resource and its exception is
+        raised.
+
+        Parameters:
+            resources       List of resources to validate
+            max_workers     Maximum number of resources to validate concurrently
+
+        Returns:
+            None
+        '''
+        if len(resources) <= 1:
+
+            for resource in resources:
+                resource.validate()
+
+            return
+
+        with concurrent.futures.ThreadPoolExecutor(min(max_workers, len(resources))) as executor:
+            futures = [executor.submit(resource._validate_buffered) for resource in resources]
+
+        for future in futures:
+
+            output, error = future.result()
+            Logger.write(output, end='')
+
+            if error is not None:
+                raise error
+
+
+def file_stamp(path: pathlib.Path) -> list[int]:
+    '''
+    Returns a stamp that changes whenever the specified file is modified.
+
+    Parameters:
+        path            Path of the file to create the stamp for
+
+    Returns:
+        stamp           List of inode, modification time and size
+    '''
+    st = path.stat()
+    return [st.st_ino, st.st_mtime_ns, st.st_size]
+
+
+def load_hash_cache() -> dict:
+    '''
+    Returns the on disk hash cache. The cache is loaded on first use and maps
+    resolved file paths to a dict with the file stamp and the computed hashes.
+    A missing or corrupted cache file results in an empty cache. The cache is
+    only used when HASH_CACHE was set to the path of the cache file.
+
+    Parameters:
+        None
+
+    Returns:
+        cache           Hash cache dictionary
+    '''
+    global hash_cache
+
+    if hash_cache is None:
+
+        try:
+            hash_cache = json.loads(HASH_CACHE.read_text())
+
+            if type(hash_cache) is not dict:
+                hash_cache = {}
+
+        except (OSError, ValueError):
+            hash_cache = {}
+
+    return hash_cache
+
+
+def get_cache_entry(cache: dict, key: str, stamp: list[int]) -> dict:
+    '''
+    Returns the entry of the hash cache for the specified key. Entries that do not
+    match the specified stamp or that are malformed are treated as missing.
+
+    Parameters:
+        cache           Hash cache dictionary
+        key             Resolved path of the file to obtain the entry for
+        stamp           Current stamp of the file
+
+    Returns:
+        entry           Cache entry or None
+    '''
+    entry = cache.get(key)
+
+    if type(entry) is not dict or entry.get('stamp') != stamp or type(entry.get('hashes')) is not dict:
+        return None
+
+    return entry
+
+
+def get_cached_hash(path: pathlib.Path, hash_type: str, stamp: list[int]) -> str:
+    '''
+    Returns the cached hash of the specified type for the specified file. If the
+    file was modified since the hash was computed or no hash cache is configured,
+    None is returned.
+
+    Parameters:
+        path            Path of the file to obtain the hash for
+        hash_type       Hash type to obtain
+        stamp           Stamp of the file before its content is read
+
+    Returns:
+        hash            Cached hex digest or None
+    '''
+    if HASH_CACHE is None:
+        return None
+
+    with hash_cache_lock:
+        entry = get_cache_entry(load_hash_cache(), str(path.resolve()), stamp)
+
+    if entry is None or type(entry['hashes'].get(hash_type)) is not str:
+        return None
+
+    return entry['hashes'][hash_type]
+
+
+def set_cached_hash(path: pathlib.Path, hash_type: str, digest: str, stamp: list[int]) -> None:
+    '''
+    Stores a computed hash for the specified file in the hash cache and writes the
+    cache back to disk. Errors while writing the cache are ignored, as the cache
+    only saves work. Does nothing if no hash cache is configured. The stamp needs
+    to be taken before the file is read, so that modifications during the hash
+    computation invalidate the cached hash.
+
+    Parameters:
+        path            Path of the file the hash was computed for
+        hash_type       Type of the computed hash
+        digest          Computed hex digest
+        stamp           Stamp of the file before its content was read
+
+    Returns:
+        None
+    '''
+    if HASH_CACHE is None:
+        return
+
+    key = str(path.resolve())
+
+    with hash_cache_lock:
+
+        cache = load_hash_cache()
+        entry = get_cache_entry(cache, key, stamp)
+
+        if entry is None:
+            entry = cache[key] = {'stamp': stamp, 'hashes': {}}
+
+        entry['hashes'][hash_type] = digest
+
+        try:
+            HASH_CACHE.parent.mkdir(parents=True, exist_ok=True)
+
+            with tempfile.NamedTemporaryFile('w', dir=HASH_CACHE.parent, delete=False) as f:
+
+                try:
+                    json.dump(cache, f)
+                    f.close()
+                    os.replace(f.name, HASH_CACHE)
+
+                finally:
+                    pathlib.Path(f.name).unlink(missing_ok=True)
+
+        except OSError:
+            pass
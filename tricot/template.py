@@ -156,7 +156,7 @@ tricot.register_extractor('my_extractor', MyExtractor)
 def replace_placeholders(template: str) -> str:
     '''
     Replaces the palceholders within a template. Accepted placeholders
-    are currently the plugin and validator names.
+    are currently the plugin and validator names (<PLUGIN> and <VALIDATOR>).
 
     Parameters:
         template    YAML template to replace parameters in
@@ -164,16 +164,8 @@ def replace_placeholders(template: str) -> str:
     Returns:
         YAML template with placeholders replaced
     '''
-    val_list = tricot.get_validator_list()
-    val_replace = '\n      - '.join(val_list)
-
-    replaced = template.replace('<VALIDATOR>', val_replace)
-
-    plug_list = tricot.get_plugin_list()
-    plug_replace = '\n  - '.join(plug_list)
-
-    replaced = replaced.replace('<PLUGIN>', plug_replace)
-    return replaced
+    replaced = template.replace('<VALIDATOR>', '\n      - '.join(tricot.get_validator_list()))
+    return replaced.replace('<PLUGIN>', '\n  - '.join(tricot.get_plugin_list()))
 
 
 def write_template(filename: str, mode: str) -> None:
@@ -199,5 +191,5 @@ def write_template(filename: str, mode: str) -> None:
     elif mode.lower() == 'extractor':
         prepared_template = extractor_template
 
-    with open(filename, 'w') as f:
-        f.write(prepared_template)
+    with open(filename, 'wb') as f:
+        f.write(prepared_template.encode())
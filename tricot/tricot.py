@@ -1,8 +1,11 @@
 from __future__ import annotations
 
-import copy
+import os
+import re
 import yaml
 import glob
+import warnings
+import concurrent.futures
 from shutil import which
 from typing import Any, Union
 from pathlib import Path
@@ -20,6 +23,15 @@ from tricot.resource import Resource
 
 skip_until = None
 assigned_ids = set()
+yaml_cache = {}
+var_patterns = {}
+
+if hasattr(yaml, 'CSafeLoader'):
+    YamlLoader = yaml.CSafeLoader
+
+else:
+    YamlLoader = yaml.SafeLoader
+    warnings.warn('PyYAML was built without libyaml support. Falling back to the slower SafeLoader.', ImportWarning)
 
 
 class DuplicateIDError(Exception):
@@ -113,6 +125,7 @@ class TestKeyError(Exception):
 
         self.path = str(path.resolve())
         self.number = None
+        self.formatted = self.message + 'tests section.'
 
         super().__init__(self.message)
 
@@ -120,22 +133,126 @@ class TestKeyError(Exception):
         '''
         The default content of the exception indicates a missing key within a test configuration.
         This function can be used to add the position of the corresponding test within the .yml
-        file.
+        file. The formatted message is updated accordingly.
         '''
         self.number = ctr
 
+        if self.number is not None:
+            ordinal = tricot.utils.make_ordinal(self.number)
+            self.formatted = self.message + f'{ordinal} test in the tests section.'
+
     def __str__(self) -> str:
         '''
         Depending whether the execption contains the test number (self.number), the exception
-        is formatted a little bit differently.
+        is formatted a little bit differently. The message is formatted when the number is added.
         '''
-        message = self.message
+        return self.formatted
 
-        if self.number:
-            ordinal = tricot.utils.make_ordinal(self.number)
-            message += f'{ordinal} test in the '
 
-        return message + 'tests section.'
+def load_yaml(filename: Union[str, Path]) -> Any:
+    '''
+    Loads the specified .yml file. Parsed files are cached by their real path, modification
+    time and size, so that files that are referenced multiple times (e.g. by several
+    testers) are only parsed once. As the parsed content is modified while Testers and
+    Tests are created, a deep copy (see utils.clone) of the cached content is returned. The file is passed
+    to the parser as binary stream, which reads it in chunks and detects the encoding.
+
+    Parameters:
+        filename        File system path to the .yml file
+
+    Returns:
+        content         Parsed content of the .yml file
+    '''
+    real_path = os.path.realpath(filename)
+    stat = os.stat(real_path)
+    key = (real_path, stat.st_mtime_ns, stat.st_size)
+
+    if key not in yaml_cache:
+
+        with open(real_path, 'rb') as f:
+
+            try:
+                yaml_cache[key] = yaml.load(f, Loader=YamlLoader)
+
+            except (yaml.parser.ParserError, yaml.scanner.ScannerError) as e:
+                raise ExceptionWrapper(e, Path(filename))
+
+    return tricot.utils.clone(yaml_cache[key])
+
+
+def clear_yaml_cache() -> None:
+    '''
+    Clears the cache of parsed .yml files. This is only required when tricot is used
+    as a library and configuration files are modified within the same timestamp.
+
+    Parameters:
+        None
+
+    Returns:
+        None
+    '''
+    yaml_cache.clear()
+
+
+def assign_id(assigned_id: str) -> None:
+    '''
+    Registers the specified Test / Tester ID. IDs are used for filtering across all
+    configuration files of a run and need to be unique. Duplicates are detected by
+    the size of the registry, which saves a separate membership check.
+
+    Parameters:
+        assigned_id     ID to register
+
+    Returns:
+        None
+    '''
+    size = len(assigned_ids)
+    assigned_ids.add(assigned_id)
+
+    if len(assigned_ids) == size:
+        raise DuplicateIDError(f"ID '{assigned_id}' was assigned twice.")
+
+
+def clear_assigned_ids() -> None:
+    '''
+    Clears the registry of assigned Test / Tester IDs. This is only required when tricot
+    is used as a library and independent configurations are loaded within one process.
+
+    Parameters:
+        None
+
+    Returns:
+        None
+    '''
+    assigned_ids.clear()
+
+
+def compile_var_regex(variables: dict[str, Any]) -> tuple[re.Pattern, dict[str, Any], dict[str, int]]:
+    '''
+    Returns a compiled regex that matches the placeholders of all specified variables,
+    together with a dict that maps placeholder names to the original variable keys and
+    a dict that maps placeholder names to the position of the variable. Results are
+    cached by the ordered variable keys, as most tests share them.
+
+    Parameters:
+        variables       Variables to create the regex for
+
+    Returns:
+        pattern         Compiled regex, the name to key mapping and the name to position mapping
+    '''
+    cache_key = tuple(variables)
+    cached = var_patterns.get(cache_key)
+
+    if cached is None:
+
+        names = {str(key): key for key in variables}
+        positions = {str(key): position for position, key in enumerate(variables)}
+        alternatives = '|'.join(map(re.escape, names)) or '(?!)'
+
+        cached = (re.compile(r'\$\{(' + alternatives + r')\}'), names, positions)
+        var_patterns[cache_key] = cached
+
+    return cached
 
 
 class Test:
@@ -145,8 +262,8 @@ class Test:
     specified variables and the required validators. During a test, Test objects are
     evaluated by executing their 'run' method.
     '''
-    expected_keys = ['title', 'description', 'command', 'arguments', 'validators', 'timeout', 'env', 'conditions',
-                     'logfile', 'shell', 'extractors', 'id', 'groups']
+    expected_keys = frozenset(['title', 'description', 'command', 'arguments', 'validators', 'timeout', 'env', 'conditions',
+                               'logfile', 'shell', 'extractors', 'id', 'groups'])
 
     def __init__(self, path: Path, title: str, error_mode: str, variables: dict[str, Any], command: Command,
                  timeout: int, validators: list[Validator], extractors: list[Extractor], env: dict, conditions: dict,
@@ -178,7 +295,7 @@ class Test:
         self.variables = variables
         self.command = command
         self.timeout = timeout
-        self.validators = validators
+        self.validators = sorted(validators, key=lambda validator: validator.cost)
         self.extractors = extractors
         self.env = env
         self.conditions = conditions
@@ -190,13 +307,16 @@ class Test:
         else:
             self.id = str(test_id)
 
-            if self.id in assigned_ids:
-                raise DuplicateIDError(f"ID '{self.id}' was assigned twice.")
-
-            assigned_ids.add(self.id)
+            assign_id(self.id)
 
         self.groups = test_groups
 
+        if self.id and self.id != self.title:
+            self.display_title = f'[{self.id}] {self.title}...'
+
+        else:
+            self.display_title = f'{self.title}...'
+
         self.logfile = None
         self.success_string = 'success'
         self.failure_string = 'failed'
@@ -205,7 +325,9 @@ class Test:
 
     def set_logfile(self, logfile: str) -> None:
         '''
-        Sets the logfile attribute on the Test object.
+        Sets the logfile attribute on the Test object. The logfile is opened by the
+        Logger when the test runs, so that logfiles of filtered tests are not
+        created or truncated.
 
         Parameters:
             logfile         File system path to the logfile
@@ -216,8 +338,7 @@ class Test:
         if logfile is None:
             return
 
-        logfile = tricot.utils.apply_variables(logfile, self.variables)
-        self.logfile = open(logfile, 'w')
+        self.logfile = tricot.utils.apply_variables(logfile, self.variables)
 
     def set_output(self, output_conf: dict) -> None:
         '''
@@ -245,17 +366,23 @@ class Test:
         tricot.utils.validate_color(self.success_color)
         tricot.utils.validate_color(self.failure_color)
 
-    def apply_variables(val: Union(str, list), variables: dict[str, Any], k: str = 'command') -> list:
+    def apply_variables(val: Union(str, list), variables: dict[str, Any], k: str = 'command', var_regex: tuple = None) -> list:
         '''
         Applies variables to a command or argument list/string. This method needs to be
         static, as it is applied right at the object creation. This is the only way to
         allow command lists to be specified within variables while simoultaneously checking
         types on object creation.
 
+        Variables are applied in the order of the variables dict. Placeholders within the
+        value of a variable are therefore expanded by the variables that follow it. All
+        placeholders are matched by one regex and each referenced variable value is only
+        expanded once per call. Items of list variables are converted to str.
+
         Parameters:
             val             Value to replace variables in. Usually the command or arguments portion of .yml files
             variables       Variables to apply
             k               Current key value (command|arguments)
+            var_regex       Result of compile_var_regex for the variables (computed if None)
 
         Returns:
             None
@@ -263,43 +390,105 @@ class Test:
         if val is None:
             return []
 
-        for key, value in variables.items():
+        if type(val) is list and (not variables or not any(type(item) is str and '${' in item for item in val)):
+            return [item if type(item) is str else str(item) for item in val]
 
-            value = tricot.utils.resolve_runtime_variables(variables, key, value)
-            value = tricot.utils.resolve_env_variables(variables, key, value)
-            key = '${'+str(key)+'}'
+        if type(val) is str and '${' not in val:
+            raise ValueError(f"The '{k}' key needs to be a list within the ")
 
-            if type(val) is str:
+        pattern, names, positions = var_regex or compile_var_regex(variables)
+        fullmatch, sub = pattern.fullmatch, pattern.sub
+        expanded = {}
 
-                if val == key and type(value) is list:
-                    val = value.copy()
+        def resolve(name: str) -> Any:
+            key = names[name]
+            value = tricot.utils.resolve_runtime_variables(variables, key, variables[key])
+            return tricot.utils.resolve_env_variables(variables, key, value)
 
-                else:
-                    val = val.replace(key, str(value))
+        def expand_str(text: str, start: int) -> str:
+            '''
+            Replaces the placeholders of all variables from position {start} on.
+            '''
+            if '${' not in text:
+                return text
 
-            elif type(val) is list:
+            def replace(match: re.Match) -> str:
 
-                for ctr in range(len(val)):
+                name = match[1]
+                position = positions[name]
 
-                    if type(val[ctr]) is str:
+                if position < start:
+                    return match[0]
 
-                        if val[ctr] == key and type(value) is list:
-                            val[ctr:ctr+1] = value
+                if position not in expanded:
+                    expanded[position] = expand_str(str(resolve(name)), position + 1)
 
-                        else:
-                            val[ctr] = val[ctr].replace(key, str(value))
+                return expanded[position]
 
-                    else:
-                        val[ctr] = str(val[ctr])
+            return sub(replace, text)
+
+        def expand_item(item: str, start: int) -> Union[str, list[str]]:
+            '''
+            Like expand_str, but items that consist of a placeholder for a list variable
+            are expanded to the list items.
+            '''
+            if '${' not in item:
+                return item
+
+            match = fullmatch(item)
+
+            if match is not None and positions[match[1]] >= start:
 
-        if type(val) is not list:
+                position = positions[match[1]]
+                value = resolve(match[1])
+
+                if type(value) is list:
+                    return expand_list(value, position + 1)
+
+                return expand_item(str(value), position + 1)
+
+            return expand_str(item, start)
+
+        def expand_list(items: list, start: int) -> list[str]:
+            '''
+            Applies expand_item to each item and joins the results.
+            '''
+            result = []
+            append = result.append
+
+            for item in items:
+
+                if type(item) is not str:
+                    append(str(item))
+                    continue
+
+                item = expand_item(item, start)
+
+                if type(item) is list:
+                    result += item
+
+                else:
+                    append(item)
+
+            return result
+
+        if type(val) is str:
+
+            val = expand_item(val, 0)
+
+            if type(val) is not list:
+                raise ValueError(f"The '{k}' key needs to be a list within the ")
+
+            return val
+
+        elif type(val) is not list:
             raise ValueError(f"The '{k}' key needs to be a list within the ")
 
-        return val
+        return expand_list(val, 0)
 
     def from_dict(path: Path, input_dict: dict, variables: dict[str, Any] = {}, error_mode: str = 'continue',
                   environment: dict = {}, conditionals: set[Condition] = set(), output_conf: dict = {},
-                  parent_groups: list[list[str]] = list(), suggested_id: str = None) -> Test:
+                  parent_groups: list[list[str]] = list(), suggested_id: str = None, var_regex: tuple = None) -> Test:
         '''
         Creates a Test object from a dictionary. The dictionary is expected to be the content
         read in of a .yml file and needs all keys that are required for a test (validators,
@@ -315,16 +504,24 @@ class Test:
             output_conf     Output configuration inherited by the tester
             parent_groups   Test groups inherited from the parent tester
             suggested_id    Tets ID suggested by the id_pattern
+            var_regex       Result of compile_var_regex for the inherited variables
 
         Returns:
             Test            Newly generated Test object
         '''
         try:
             j = input_dict
-            var = tricot.utils.merge(variables, j.get('variables', {}), 'variables', path)
+
+            if 'variables' in j:
+                var = tricot.utils.merge(variables, j['variables'], 'variables', path)
+                tricot.utils.check_variables(var)
+
+            else:
+                var = variables
+
             validators = Validator.from_list(path, j['validators'], var)
             extractors = Extractor.from_list(path, j.get('extractors', []), var)
-            groups = tricot.utils.merge_groups(parent_groups, list(map(lambda x: str(x), j.get('groups', []))))
+            groups = tricot.utils.merge_groups(parent_groups, [str(group) for group in j.get('groups', [])])
 
             e_mode = j.get('error_mode') or error_mode
             env = tricot.utils.merge_environment(j.get('env'), environment, path)
@@ -332,8 +529,11 @@ class Test:
 
             Condition.check_format(path, conditions, conditionals)
 
-            command = Test.apply_variables(j['command'], var)
-            arguments = Test.apply_variables(j.get('arguments'), var, 'arguments')
+            if j.get('variables'):
+                var_regex = None
+
+            command = Test.apply_variables(j['command'], var, var_regex=var_regex)
+            arguments = Test.apply_variables(j.get('arguments'), var, 'arguments', var_regex)
 
             if type(command) is not list:
                 raise TestKeyError(None, path, "The 'command' key needs to be a list within the ")
@@ -353,7 +553,10 @@ class Test:
                         conditions, conditionals, j.get('id', suggested_id), groups)
 
             test.set_logfile(j.get('logfile'))
-            test.set_output(tricot.utils.merge(output_conf, j.get('output', {}), 'output', path))
+            if 'output' in j:
+                output_conf = tricot.utils.merge(output_conf, j['output'], 'output', path)
+
+            test.set_output(output_conf)
 
             return test
 
@@ -391,6 +594,8 @@ class Test:
         if type(input_list) is not list:
             raise TestKeyError(None, path, 'Test defintions need to be specified as list within the ')
 
+        var_regex = compile_var_regex(variables)
+
         for ctr in range(len(input_list)):
 
             if id_pattern is not None:
@@ -401,7 +606,7 @@ class Test:
 
             try:
                 test = Test.from_dict(path, input_list[ctr], variables, error_mode, env, conditionals,
-                                      output_conf, parent_groups, suggested_id)
+                                      output_conf, parent_groups, suggested_id, var_regex)
                 tests.append(test)
 
             except TestKeyError as e:
@@ -431,13 +636,7 @@ class Test:
         Returns
             list[Test]      List of Test objects created from the .yml input
         '''
-        with open(path, 'r') as config:
-
-            try:
-                config_dict = yaml.safe_load(config.read())
-
-            except (yaml.parser.ParserError, yaml.scanner.ScannerError) as e:
-                raise ExceptionWrapper(e, path)
+        config_dict = load_yaml(path)
 
         if 'tests' in config_dict and type(config_dict['tests']) is list:
             return Test.from_list(path, config_dict['tests'], variables, error_mode, env, conditionals, output_conf,
@@ -445,7 +644,8 @@ class Test:
 
         return []
 
-    def run(self, prefix: str = '-', hotplug_variables: dict[str, Any] = None) -> None:
+    def run(self, prefix: str = '-', hotplug_variables: dict[str, Any] = None,
+            future: concurrent.futures.Future = None) -> None:
         '''
         Runs the Test and applies all specified validators to the command output.
         Depending on the current error_mode, the function may raise exceptions and
@@ -455,16 +655,13 @@ class Test:
         Parameters:
             prefix              Optional prefix to include for each test title
             hotplug_variables   Variables that are applied at runtime.
+            future              Future of the already started test command (see Tester.run_tests)
 
         Returns:
             None
         '''
         Logger.add_logfile(self.logfile)
-
-        if self.id and self.id != self.title:
-            Logger.print_blue(f'{prefix} [{self.id}] {self.title}...', end=' ', flush=True)
-        else:
-            Logger.print_blue(f'{prefix} {self.title}...', end=' ', flush=True)
+        Logger.print_blue(f'{prefix} {self.display_title}', end=' ', flush=True)
 
         success = True
 
@@ -472,71 +669,93 @@ class Test:
             Logger.cprint('skipped.', color='grey')
             return
 
-        self.command.run(self.path.parent, self.timeout, hotplug_variables, self.env)
-        extractor_error = None
+        self.command.run(self.path.parent, self.timeout, hotplug_variables, self.env, future)
 
-        for extractor in self.extractors:
+        with Logger.batched():
 
-            try:
-                extractor._extract(self.command, hotplug_variables)
+            extractor_error = None
 
-            except Exception as e:
+            for extractor in self.extractors:
 
-                if extractor.on_miss == 'continue':
-                    continue
+                try:
+                    extractor._extract(self.command, hotplug_variables)
 
-                elif extractor.on_miss == 'warn':
-                    Logger.extract_warning(e, extractor)
-                    continue
+                except Exception as e:
 
-                elif extractor.on_miss == 'break':
-                    extractor_error = e
-                    break
+                    if extractor.on_miss == 'continue':
+                        continue
 
-        for validator in self.validators:
+                    elif extractor.on_miss == 'warn':
+                        Logger.extract_warning(e, extractor)
+                        continue
 
-            try:
-                validator._run(self.command, hotplug_variables, extractor_error)
+                    elif extractor.on_miss == 'break':
+                        extractor_error = e
+                        break
 
-            except Exception as e:
+            for validator in self.validators:
 
-                if success:
-                    f_color = validator.failure_color or self.failure_color
-                    f_string = validator.failure_string or self.failure_string
-                    Logger.cprint(f_string, color=f_color)
+                try:
+                    validator._run(self.command, hotplug_variables, extractor_error)
 
-                if extractor_error is not None:
-                    tricot.constants.LAST_ERROR = tricot.constants.EXTRACT_EXCEPTION
-                else:
-                    tricot.constants.LAST_ERROR = tricot.constants.VALIDATION_EXCEPTION
+                except Exception as e:
 
-                Logger.handle_error(e, validator)
-                Condition.update_conditions(self.conditions, self.conditionals, True)
+                    if success:
+                        f_color = validator.failure_color or self.failure_color
+                        f_string = validator.failure_string or self.failure_string
+                        Logger.cprint(f_string, color=f_color)
 
-                if self.error_mode == "break":
-                    Logger.remove_logfile(self.logfile)
-                    Logger.decrease_indent()
+                    if extractor_error is not None:
+                        tricot.constants.LAST_ERROR = tricot.constants.EXTRACT_EXCEPTION
+                    else:
+                        tricot.constants.LAST_ERROR = tricot.constants.VALIDATION_EXCEPTION
 
-                    if extractor_error:
-                        raise extractor_error
+                    Logger.handle_error(e, validator)
+                    Condition.update_conditions(self.conditions, self.conditionals, True)
 
-                    raise ValidationException('')
+                    if self.error_mode == "break":
+                        Logger.flush_batch()
+                        Logger.remove_logfile(self.logfile)
+                        Logger.decrease_indent()
 
-                elif extractor_error is not None:
-                    success = False
-                    break
+                        if extractor_error:
+                            raise extractor_error
 
-                else:
-                    success = False
+                        raise ValidationException('')
+
+                    elif extractor_error is not None:
+                        success = False
+                        break
 
-        if success:
-            Condition.update_conditions(self.conditions, self.conditionals, False)
-            Logger.cprint(self.success_string, color=self.success_color)
-            Logger.handle_success(self.command, self.validators)
+                    else:
+                        success = False
+
+            if success:
+                Condition.update_conditions(self.conditions, self.conditionals, False)
+                Logger.cprint(self.success_string, color=self.success_color)
+                Logger.handle_success(self.command, self.validators)
 
         hotplug_variables['$prev'] = self.command
+        Logger.flush_logfiles()
         Logger.remove_logfile(self.logfile)
 
+    def start(self, executor: concurrent.futures.Executor, hotplug_variables: dict[str, Any]) -> concurrent.futures.Future:
+        '''
+        Starts the test command in advance within the specified executor. Tests with conditions
+        depend on the outcome of previous tests and are never started in advance.
+
+        Parameters:
+            executor            Executor to start the command in
+            hotplug_variables   Variables that are applied at runtime.
+
+        Returns:
+            future              Future to pass to the run function or None
+        '''
+        if self.conditions:
+            return None
+
+        return self.command.start(executor, self.path.parent, self.timeout, hotplug_variables, self.env)
+
     def skip_test(self, exclude: set[str], exclude_groups: list[list[str]]) -> bool:
         '''
         Checks whether the current test is contained within the exclude lists.
@@ -568,7 +787,8 @@ class Tester:
 
     def __init__(self, path: Path, title: str, variables: dict[str, Any], tests: list[Test], testers: list[Tester],
                  containers: list[TricotContainer], plugins: list[Plugin], conditions: dict, conditionals: set[Condition],
-                 error_mode: str, tester_id: str, test_groups: list[list[str]], requires: dict) -> None:
+                 error_mode: str, tester_id: str, test_groups: list[list[str]], requires: dict,
+                 parallel: int = 1, parallel_containers: bool = False) -> None:
         '''
         Initializes a new Tester object.
 
@@ -586,6 +806,8 @@ class Tester:
             tester_id       Unique identifikation number of the tester
             test_groups     Test groups that the tester belongs to
             requires        Requirements to run the tester
+            parallel        Maximum number of test commands to run concurrently
+            parallel_containers   Whether containers are started and stopped concurrently
 
         Returns:
             None
@@ -595,8 +817,8 @@ class Tester:
         self.variables = variables
         self.tests = tests
         self.testers = testers
-        self.containers = containers
-        self.plugins = plugins
+        self.containers = tuple(containers or ())
+        self.plugins = tuple(plugins or ())
         self.conditions = conditions
         self.conditionals = conditionals
         self.error_mode = error_mode
@@ -607,16 +829,17 @@ class Tester:
         else:
             self.id = str(tester_id)
 
-            if self.id in assigned_ids:
-                raise DuplicateIDError(f"ID '{self.id}' was assigned twice.")
-
-            assigned_ids.add(self.id)
+            assign_id(self.id)
 
         self.groups = test_groups
         self.requires = requires
+        self.parallel = parallel
+        self.parallel_containers = parallel_containers
 
         self.logfile = None
         self.runall = False
+        self.id_set = None
+        self.group_list = None
 
     def from_dict(input_dict: dict, initial_vars: dict[str, Any] = dict(),
                   path: Path = None, e_mode: str = None, environment: dict = {},
@@ -651,6 +874,15 @@ class Tester:
             run_conds = t.get('conditions', {})
             output_c = tricot.utils.merge(output_conf, t.get('output', {}), 'output', path)
             id_pattern = tricot.utils.verify_id_pattern(t.get('id_pattern'), path)
+            parallel = t.get('parallel', 1)
+
+            if type(parallel) is not int or parallel < 1:
+                raise TricotException("Tester attribute 'parallel' needs to be a positive integer.", path)
+
+            parallel_containers = t.get('parallel_containers', False)
+
+            if type(parallel_containers) is not bool:
+                raise TricotException("Tester attribute 'parallel_containers' needs to be a boolean.", path)
 
             Condition.check_format(path, run_conds, conds)
 
@@ -658,11 +890,13 @@ class Tester:
             definitions = g.get('tests')
             includes = g.get('include')
 
-            groups = tricot.utils.merge_groups(test_groups, list(map(lambda x: str(x), t.get('groups', []))))
+            groups = tricot.utils.merge_groups(test_groups, [str(group) for group in t.get('groups', [])])
 
             variables = tricot.utils.merge(initial_vars, g.get('variables', {}), 'variables', path)
             variables['cwd'] = path.parent
-            variables = tricot.utils.apply_variables(variables, copy.deepcopy(variables))
+
+            tricot.utils.check_variables(variables)
+            variables = tricot.utils.apply_variables(variables, tricot.utils.copy_variables(variables))
 
             plugins = Plugin.from_list(path, g.get('plugins'), variables)
             containers = TricotContainer.from_list(g.get('containers', list()), path, variables)
@@ -670,15 +904,27 @@ class Tester:
             tester_list = list()
             if testers and type(testers) is list:
 
+                parent = path.parent
+
                 for f in testers:
 
-                    if not Path(f).is_absolute():
-                        f = path.parent.joinpath(f)
+                    f = Path(f)
 
+                    if not f.is_absolute():
+                        f = parent / f
+
+                    pattern = str(f)
                     testers_to_add = []
-                    for ff in sorted(glob.glob(str(f))):
 
-                        if Path(ff).is_file() and (ff.endswith('.yml') or ff.endswith('.yaml')):
+                    if glob.has_magic(pattern):
+                        matches = map(Path, sorted(glob.glob(pattern)))
+
+                    else:
+                        matches = [f]
+
+                    for ff in matches:
+
+                        if ff.name.endswith(('.yml', '.yaml')) and ff.is_file():
                             tester = Tester.from_file(ff, variables, None, error_mode, env, conds, output_c, groups)
                             testers_to_add.append(tester)
 
@@ -702,7 +948,8 @@ class Tester:
             tests = tests if tests else None
 
             new_tester = Tester(path, t['title'], variables, tests, tester_list, containers, plugins,
-                                run_conds, conds, error_mode, t.get('id'), groups, t.get('requires'))
+                                run_conds, conds, error_mode, t.get('id'), groups, t.get('requires'), parallel,
+                                parallel_containers)
             new_tester.set_logfile(t.get('logfile'))
 
             return new_tester
@@ -712,7 +959,9 @@ class Tester:
 
     def set_logfile(self, logfile: str) -> None:
         '''
-        Sets the logfile attribute on the Tester object.
+        Sets the logfile attribute on the Tester object. The logfile is opened by the
+        Logger when the tester runs, so that logfiles of filtered testers are not
+        created or truncated.
 
         Parameters:
             logfile         File system path to the logfile
@@ -723,10 +972,9 @@ class Tester:
         if logfile is None:
             return
 
-        logfile = tricot.utils.apply_variables(logfile, self.variables)
-        self.logfile = open(logfile, 'w')
+        self.logfile = tricot.utils.apply_variables(logfile, self.variables)
 
-    def from_file(filename: str, initial_vars: dict[str, Any] = dict(), runtime_vars: dict[str, Any] = None,
+    def from_file(filename: Union[str, Path], initial_vars: dict[str, Any] = dict(), runtime_vars: dict[str, Any] = None,
                   error_mode: str = None, env: dict = {}, conditionals: set[Condition] = set(),
                   output_conf: dict = {}, test_groups: list[list[str]] = []) -> Tester:
         '''
@@ -746,13 +994,8 @@ class Tester:
         Returns:
             Tester          Tester object created from the file
         '''
-        with open(filename, 'r') as f:
-
-            try:
-                config_dict = yaml.safe_load(f.read())
-
-            except (yaml.parser.ParserError, yaml.scanner.ScannerError) as e:
-                raise ExceptionWrapper(e, Path(filename))
+        path = Path(filename)
+        config_dict = load_yaml(path)
 
         if '$env' not in initial_vars:
             tricot.utils.add_environment(initial_vars)
@@ -760,7 +1003,7 @@ class Tester:
         if runtime_vars is not None and '$runtime' not in initial_vars:
             initial_vars['$runtime'] = runtime_vars
 
-        return Tester.from_dict(config_dict, initial_vars, Path(filename), error_mode, env, conditionals,
+        return Tester.from_dict(config_dict, initial_vars, path, error_mode, env, conditionals,
                                 output_conf, test_groups)
 
     def contains_id(self, t_ids: set[str]) -> bool:
@@ -776,21 +1019,38 @@ class Tester:
         if not t_ids or self.runall:
             return True
 
-        if self.id and {self.id}.issubset(t_ids):
+        if self.id and self.id in t_ids:
             self.runall = True
             return True
 
-        if self.tests:
+        return not self.get_id_set().isdisjoint(t_ids)
 
-            for test in self.tests:
-                if test.id and {test.id}.issubset(t_ids):
-                    return True
+    def get_id_set(self) -> frozenset[str]:
+        '''
+        Returns the IDs of all tests and testers that are contained within this tester.
+        The set is computed on first use and cached afterwards, as the tester tree is
+        not extended after its creation.
 
-        for tester in self.testers:
-            if tester.contains_id(t_ids):
-                return True
+        Parameters:
+            None
 
-        return False
+        Returns:
+            id_set          Set of contained Test / Tester IDs
+        '''
+        if self.id_set is None:
+
+            id_set = {test.id for test in self.tests or [] if test.id}
+
+            for tester in self.testers:
+
+                if tester.id:
+                    id_set.add(tester.id)
+
+                id_set |= tester.get_id_set()
+
+            self.id_set = frozenset(id_set)
+
+        return self.id_set
 
     def contains_group(self, t_groups: list[list[str]]) -> bool:
         '''
@@ -809,17 +1069,40 @@ class Tester:
             self.runall = True
             return True
 
-        if self.tests:
+        return tricot.utils.groups_contain(t_groups, self.get_group_list())
 
-            for test in self.tests:
-                if tricot.utils.groups_contain(t_groups, test.groups):
-                    return True
+    def get_group_list(self) -> list[list[str]]:
+        '''
+        Returns the distinct groups of all tests and testers that are contained within
+        this tester. As groups are inherited, most tests share the groups of their tester
+        and the list is usually much shorter than the number of tests. The list is computed
+        on first use and cached afterwards.
 
-        for tester in self.testers:
-            if tester.contains_group(t_groups):
-                return True
+        Parameters:
+            None
 
-        return False
+        Returns:
+            group_list      List of contained groups
+        '''
+        if self.group_list is None:
+
+            group_dict = {}
+
+            for test in self.tests or []:
+                for group in test.groups:
+                    group_dict.setdefault(tuple(group), group)
+
+            for tester in self.testers:
+
+                for group in tester.groups:
+                    group_dict.setdefault(tuple(group), group)
+
+                for group in tester.get_group_list():
+                    group_dict.setdefault(tuple(group), group)
+
+            self.group_list = list(group_dict.values())
+
+        return self.group_list
 
     def skip_test(self, exclude: set[str], exclude_groups: list[list[str]]) -> bool:
         '''
@@ -857,17 +1140,21 @@ class Tester:
 
         requires = tricot.utils.apply_variables(self.requires, self.variables)
 
-        for file in requires.get('files', []):
+        try:
+            resources = []
+
+            for file in requires.get('files', []):
 
-            try:
                 if type(file) is str:
-                    Resource({'path': file}).validate()
+                    resources.append(Resource({'path': file}))
 
                 elif type(file) is dict:
-                    Resource(file).validate()
+                    resources.append(Resource(file))
+
+            Resource.validate_all(resources)
 
-            except Exception as e:
-                raise ExceptionWrapper(e, self.path)
+        except Exception as e:
+            raise ExceptionWrapper(e, self.path)
 
         for command in requires.get('commands', []):
 
@@ -985,7 +1272,7 @@ class Tester:
             if test.skip_test(exclude, exclude_groups):
                 self.tests.remove(test)
 
-            elif ids and not {test.id}.issubset(ids):
+            elif ids and test.id not in ids:
                 self.tests.remove(test)
 
             elif groups and not tricot.utils.groups_contain(groups, test.groups):
@@ -1026,15 +1313,25 @@ class Tester:
         for plugin in self.plugins:
             plugin._run(hotplug)
 
+        if self.parallel_containers and len(self.containers) > 1:
+            TricotContainer.start_all(self.containers)
+
+        else:
+            for container in self.containers:
+                container.start_container()
+
         for container in self.containers:
-            container.start_container()
-            hotplug = {**hotplug, **container.get_container_variables()}
+            hotplug.update(container.get_container_variables())
 
         self.run_tests(hotplug)
         self.run_childs(hotplug)
 
-        for container in self.containers:
-            container.stop_container()
+        if self.parallel_containers and len(self.containers) > 1:
+            TricotContainer.stop_all(self.containers)
+
+        else:
+            for container in self.containers:
+                container.stop_container()
 
         for plugin in self.plugins:
             plugin._stop()
@@ -1044,7 +1341,8 @@ class Tester:
 
     def run_tests(self, hotplug_variables: dict[str, Any]) -> None:
         '''
-        Wrapper function that executes the tests specified in a tester.
+        Wrapper function that executes the tests specified in a tester. If the tester allows
+        parallel execution, the test commands are started in advance by run_parallel.
 
         Parameters:
             hotplug_variables   Hotplug variables to use during the test
@@ -1057,9 +1355,50 @@ class Tester:
 
         Logger.print('')
 
+        if self.parallel > 1 and len(self.tests) > 1:
+            self.run_parallel(hotplug_variables)
+            return
+
         for ctr in range(len(self.tests)):
             self.tests[ctr].run(f'{ctr+1}.', hotplug_variables)
 
+    def run_parallel(self, hotplug_variables: dict[str, Any]) -> None:
+        '''
+        Executes the tests of the tester while running up to self.parallel test commands
+        concurrently. Commands are started in batches. A batch ends after a test that defines
+        extractors or uses the break error mode, as subsequent tests may depend on the extracted
+        variables or must not run at all. Validation and output still happen in test order.
+
+        Parameters:
+            hotplug_variables   Hotplug variables to use during the test
+
+        Returns:
+            None
+        '''
+        futures = {}
+        executor = concurrent.futures.ThreadPoolExecutor(self.parallel)
+
+        try:
+
+            for ctr in range(len(self.tests)):
+
+                if ctr not in futures:
+
+                    variables = hotplug_variables.copy()
+
+                    for index in range(ctr, len(self.tests)):
+
+                        test = self.tests[index]
+                        futures[index] = test.start(executor, variables)
+
+                        if test.extractors or test.error_mode == 'break':
+                            break
+
+                self.tests[ctr].run(f'{ctr+1}.', hotplug_variables, futures.pop(ctr))
+
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
     def run_childs(self, hotplug_variables: dict[str, Any]) -> None:
         '''
         Runs the child testers of the current tester.
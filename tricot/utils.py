@@ -86,11 +86,31 @@ def resolve_env_variables(variables: dict[str, Any], key: str, value: Any) -> An
         raise TricotEnvVariableError(f"Unable to find environment variable '{key}'.")
 
 
+def check_variables(variables: dict[str, Any]) -> None:
+    '''
+    Checks whether all runtime and environment variables that are declared within
+    the variables dictionary are available. As apply_variables resolves these
+    variables only when they are referenced, this function is used to report missing
+    variables when a tester or test is loaded.
+
+    Parameters:
+        variables       Variables dictionary created during the Tester initialization
+
+    Returns:
+        None
+    '''
+    for key, value in variables.items():
+        resolve_runtime_variables(variables, key, value)
+        resolve_env_variables(variables, key, value)
+
+
 def apply_variables(candidate: Any, var_dict: dict[str, Any]) -> Any:
     '''
     Applies the variables contained in the Plugin on each str value within the
     parameters. For dictionaires and list, the function uses recursion to iterate
-    over all possible items.
+    over all possible items. Strings that do not contain a variable placeholder are
+    returned without looking at the variables at all. Runtime and environment variables
+    are only resolved when they are referenced.
 
     Parameters:
         candidate       Current param value. Required for recursion.
@@ -114,11 +134,18 @@ def apply_variables(candidate: Any, var_dict: dict[str, Any]) -> Any:
 
     elif cur_type is str:
 
+        if '${' not in candidate:
+            return candidate
+
         for var, var_value in var_dict.items():
 
+            variable_key = '${'+str(var)+'}'
+
+            if variable_key not in candidate:
+                continue
+
             var_value = resolve_runtime_variables(var_dict, var, var_value)
             var_value = resolve_env_variables(var_dict, var, var_value)
-            variable_key = '${'+str(var)+'}'
 
             if candidate == variable_key:
                 candidate = var_value
@@ -132,6 +159,49 @@ def apply_variables(candidate: Any, var_dict: dict[str, Any]) -> Any:
     return candidate
 
 
+def clone(value: Any) -> Any:
+    '''
+    Creates a deep copy of parsed .yml content. Only dictionaries, lists and sets are
+    copied, as all other types created by the yaml parser are immutable. This is
+    considerably faster than copy.deepcopy, which dispatches and memoizes each object.
+
+    Parameters:
+        value           Value to copy
+
+    Returns:
+        copy            Deep copy of the value
+    '''
+    value_type = type(value)
+
+    if value_type is dict:
+        return {key: clone(item) for key, item in value.items()}
+
+    elif value_type is list:
+        return [clone(item) for item in value]
+
+    elif value_type is set:
+        return set(value)
+
+    return value
+
+
+def copy_variables(variables: dict[str, Any]) -> dict[str, Any]:
+    '''
+    Creates a snapshot of the specified variables that can be passed to apply_variables
+    while the variables themselves are modified. apply_variables modifies lists and
+    dictionaries in place, so all values are copied recursively using clone. The only
+    exception is the environment in the '$env' key, which is only read while variables
+    are resolved and is therefore shared with the original dictionary.
+
+    Parameters:
+        variables       Variable dictionary
+
+    Returns:
+        snapshot        Copy of the variable dictionary
+    '''
+    return {key: value if key == '$env' else clone(value) for key, value in variables.items()}
+
+
 def make_ordinal(n: int) -> str:
     '''
     Convert an integer into its ordinal representation. Used for pretty printing and copied
@@ -149,7 +219,7 @@ def make_ordinal(n: int) -> str:
     return str(n) + suffix
 
 
-def check_keys(expected_keys: list[str], yaml_dict: dict) -> None:
+def check_keys(expected_keys: frozenset[str], yaml_dict: dict) -> None:
     '''
     What happes quite some time is that validators are indented incorrectly and appear within the test
     section of the .yml definition. This is annoying, as your test seems to work, but was actually never
@@ -157,12 +227,15 @@ def check_keys(expected_keys: list[str], yaml_dict: dict) -> None:
     encountered.
 
     Parameters:
-        expected_keys   List of keys that are expected to appear
+        expected_keys   Set of keys that are expected to appear
         yaml_dict       Python dirctionary that represents the .yml file
 
     Returns:
         None
     '''
+    if yaml_dict.keys() <= expected_keys:
+        return
+
     for key in yaml_dict.keys():
         if key not in expected_keys:
             tricot.Logger.print_yellow('Warning:', end=' ')
@@ -356,44 +429,50 @@ def groups_contain(groups_list: list[list[str]], groups: list[list[str]]) -> boo
 
         for items in groups_list:
 
-            ctr = 0
-            match = True
-            items = items.copy()
+            if group_matches(items, group):
+                return True
 
-            try:
+    return False
 
-                while len(items) != 0:
 
-                    item = items.pop(0)
+def group_matches(items: list[str], group: list[str]) -> bool:
+    '''
+    Checks whether the specified group starts with the specified group items. A '*'
+    item matches exactly one group, a '**' item skips groups until the following item
+    matches. The items are walked by index, so that no copy of the item list is
+    required.
 
-                    if item == '*' or group[ctr] == item:
+    Parameters:
+        items                 Group items to look for, possibly containing wildcards
+        group                 Group list to check
 
-                        ctr += 1
-                        continue
+    Returns:
+        bool                  True if the group matches the items
+    '''
+    ctr = 0
+    index = 0
 
-                    if item == '**':
+    try:
 
-                        item = items.pop(0)
-                        while group[ctr] != item and ctr != len(group):
-                            ctr += 1
+        while index < len(items):
 
-                        if ctr == len(group):
-                            match = False
-                            break
+            item = items[index]
+            index += 1
 
-                        ctr += 1
-                        continue
+            if item == '*' or group[ctr] == item:
+                ctr += 1
 
-                    match = False
-                    break
+            elif item == '**':
+                ctr = group.index(items[index], ctr) + 1
+                index += 1
 
-                if match:
-                    return True
+            else:
+                return False
 
-            except IndexError:
-                pass
+    except (IndexError, ValueError):
+        return False
 
-    return False
+    return True
 
 
 def merge_groups(parent_groups: list[list[str]], new_groups: list[str]) -> list[list[str]]:
@@ -401,6 +480,8 @@ def merge_groups(parent_groups: list[list[str]], new_groups: list[str]) -> list[
     This function is called by tests and testers to join groups that are defined within
     the test / tester definition with group lists that have been specified for upper testers.
     Each group in the test / tester specification is appened to the parent defined groups.
+    If no new groups are specified, the parent groups are returned as they are, as group
+    lists are never modified after their creation.
 
     Paramaters:
         parent_groups           Group lists inherited by the parent
@@ -409,6 +490,9 @@ def merge_groups(parent_groups: list[list[str]], new_groups: list[str]) -> list[
     Returns:
         merged                  Merge result
     '''
+    if not new_groups and parent_groups:
+        return parent_groups
+
     merged = list()
 
     for parent_group in (parent_groups or [[]]):
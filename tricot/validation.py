@@ -131,9 +131,14 @@ class Validator:
     invalid configuration within the .yml file should cause a ValidatorError, but
     it is recommended to only raise this error during initialization and not within
     the 'run' method (check the RegexValidator for an example).
+
+    The 'cost' class variable is a rough estimate of the work a Validator performs. Tests
+    run cheap validators (e.g. the ones that only check the status code) first, so that
+    failing tests are detected before the command output is scanned.
     '''
     param_type = None
     inner_types = None
+    cost = 10
 
     def __init__(self, path: Path, name: str, param: Any, variables: dict[str, Any]) -> None:
         '''
@@ -615,6 +620,7 @@ class StatusCodeValidator(Validator):
             - status: 0
     '''
     param_type = int
+    cost = 1
 
     def run(self) -> None:
         '''
@@ -637,6 +643,7 @@ class ErrorValidator(Validator):
             - error: False
     '''
     param_type = bool
+    cost = 1
 
     def run(self) -> None:
         '''
@@ -840,6 +847,7 @@ class RuntimeValidator(Validator):
                 gt: 5
     '''
     param_type = dict
+    cost = 1
     inner_types = {
             'lt': {'required': True, 'type': int, 'alternatives': ['gt', 'eq']},
             'gt': {'required': True, 'type': int, 'alternatives': ['lt', 'eq']},